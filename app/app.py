@@ -1,16 +1,27 @@
 import os
-import io
 import time
+import queue
+import asyncio
+import threading
 import psutil
-import base64
+import orjson
 import uvicorn
-import pandas as pd
-from typing import List
-from pydantic import BaseModel
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from dotenv import load_dotenv
+from collections import Counter as PyCounter
+from typing import IO, Any, AsyncIterator, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict
 from main import LogClassifier
 from fastapi.staticfiles import StaticFiles
+from starlette.middleware.gzip import GZipMiddleware
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, Response
+from fastapi.responses import (
+    HTMLResponse,
+    ORJSONResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi import FastAPI, Request, HTTPException, UploadFile, File
 from prometheus_client import (
     CollectorRegistry,
@@ -20,23 +31,49 @@ from prometheus_client import (
     generate_latest,
     CONTENT_TYPE_LATEST,
 )
+from prometheus_client.core import CounterMetricFamily
+
+# Read .env (GOOGLE_API_KEY) once at process entry, before any model is created
+load_dotenv()
 
 # Initialize the FastAPI app with metadata
 app = FastAPI(
     title="Vigilis Log Classifier",
     description="API and UI for classifying log messages using Regex, BERT, and LLM.",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
+# Compress larger responses (results pages, batch JSON); a modest
+# level keeps the CPU cost low under load.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Mount static files directory to serve CSS and other static assets
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 # Initialize Jinja2 templates for serving HTML pages
 templates = Jinja2Templates(directory="app/templates")
 
-# Initialize the classifier globally to reuse loaded models across requests.
-# This prevents reloading heavy models (BERT) on every request.
-classifier: LogClassifier = LogClassifier()
+# The classifier is shared across requests so heavy models (BERT) load once per
+# process. It is loaded in the background at startup and requests get a 503 until
+# it is ready. Set VIGILIS_PRELOAD_MODELS=1 to load it at import instead, e.g. in a
+# preloading master (gunicorn --preload) so forked workers share it copy-on-write.
+classifier: Optional[LogClassifier] = (
+    LogClassifier() if os.getenv("VIGILIS_PRELOAD_MODELS") == "1" else None
+)
+# Set if the background load fails, so requests report the cause instead of a 503
+# that never clears.
+classifier_error: Optional[Exception] = None
+
+# Caps concurrent regex and BERT passes offloaded to worker threads so parallel BERT
+# encodes don't oversubscribe the CPU. LLM round-trips are awaited outside it.
+CLASSIFY_SEMAPHORE: asyncio.Semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+
+# Reusable upload buffers. Buffers are allocated on demand and returned to the pool
+# after parsing, so concurrent uploads don't each allocate fresh full-size copies.
+UPLOAD_BUFFER_SIZE: int = 8 << 20
+UPLOAD_READ_CHUNK: int = 1 << 20
+BUFFER_POOL: queue.Queue = queue.Queue(maxsize=8)
 
 # --- Prometheus Metrics Configuration ---
 registry: CollectorRegistry = CollectorRegistry()
@@ -83,13 +120,141 @@ MEMORY_USAGE: Gauge = Gauge(
 )
 
 
+# Label children of PREDICTION_COUNT, resolved once per distinct label.
+_PREDICTION_CHILDREN: Dict[str, Any] = {}
+
+
+def record_predictions(labels: List[str]) -> None:
+    """
+    Increments the prediction counter once per distinct label instead of once per log.
+
+    Args:
+        labels (List[str]): The labels produced for a request.
+    """
+    for label, count in PyCounter(labels).items():
+        child = _PREDICTION_CHILDREN.get(label)
+        if child is None:
+            child = _PREDICTION_CHILDREN.setdefault(
+                label, PREDICTION_COUNT.labels(prediction=str(label))
+            )
+        child.inc(count)
+
+
+class ClassifierCacheCollector:
+    """
+    Exposes the per-stage cache hit counts tracked by the classifier's processors.
+    """
+
+    def collect(self):
+        if classifier is None:
+            return
+
+        hits = CounterMetricFamily(
+            "classifier_cache_hits",
+            "Number of classifier cache hits per stage",
+            labels=["stage"],
+        )
+        for stage, count in (
+            ("regex", classifier.regex_processor.cached_classify.cache_info().hits),
+            ("bert", classifier.bert_processor.cache.hits),
+            ("llm", classifier.llm_processor.cache.hits),
+        ):
+            hits.add_metric([stage], count)
+        yield hits
+
+
+registry.register(ClassifierCacheCollector())
+
+
+# Created once per worker at startup so each update is a single memory_info() call;
+# creating it at import would pin the pid of a preloading master process.
+PROCESS: Optional[psutil.Process] = None
+
+# Interval, in seconds, between background system metric refreshes.
+SYSTEM_METRICS_INTERVAL: float = 5.0
+
+# Rendered /metrics body, reused for METRICS_CACHE_TTL seconds so that concurrent
+# or frequent scrapes don't each walk the whole registry.
+METRICS_CACHE_TTL: float = 1.0
+_metrics_cache: Dict[str, Any] = {"ts": 0.0, "body": b""}
+_metrics_lock: threading.Lock = threading.Lock()
+
+
 def update_system_metrics() -> None:
     """
     Updates the system metrics gauge (memory usage) with the current process RSS.
     """
-    process = psutil.Process(os.getpid())
-    memory_info = process.memory_info()
-    MEMORY_USAGE.set(memory_info.rss)
+    if PROCESS is not None:
+        MEMORY_USAGE.set(PROCESS.memory_info().rss)
+
+
+async def _metrics_loop() -> None:
+    """
+    Refreshes system metrics periodically so requests never pay for them.
+    """
+    while True:
+        update_system_metrics()
+        await asyncio.sleep(SYSTEM_METRICS_INTERVAL)
+
+
+@app.on_event("startup")
+async def _start_metrics_loop() -> None:
+    """
+    Creates this worker's process handle and launches the background system metrics task.
+    """
+    global PROCESS
+    PROCESS = psutil.Process(os.getpid())
+    app.state.metrics_task = asyncio.create_task(_metrics_loop())
+
+
+async def _load_classifier() -> None:
+    """
+    Loads the classifier models in a worker thread without blocking startup.
+    """
+    global classifier, classifier_error
+    try:
+        classifier = await asyncio.to_thread(LogClassifier)
+    except Exception as e:
+        classifier_error = e
+        ERROR_COUNT.labels(type=type(e).__name__).inc()
+        print(f"Error loading classifier: {e}")
+
+
+@app.on_event("startup")
+async def _start_classifier_warmup() -> None:
+    """
+    Starts loading the classifier in the background unless it was preloaded.
+    """
+    if classifier is None:
+        app.state.warmup_task = asyncio.create_task(_load_classifier())
+
+
+def get_classifier() -> LogClassifier:
+    """
+    Returns the loaded classifier.
+
+    Returns:
+        LogClassifier: The process-wide classifier instance.
+
+    Raises:
+        HTTPException: 500 if the models failed to load, 503 if they are still loading.
+    """
+    if classifier_error is not None:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Classifier failed to load: {classifier_error}",
+        )
+    if classifier is None:
+        raise HTTPException(status_code=503, detail="Classifier is warming up.")
+    return classifier
+
+
+@app.on_event("shutdown")
+async def _stop_metrics_loop() -> None:
+    """
+    Cancels the background system metrics task.
+    """
+    app.state.metrics_task.cancel()
 
 
 # --- Pydantic Models ---
@@ -109,6 +274,8 @@ class LogResponse(BaseModel):
     Response schema for a classification result.
     """
 
+    model_config = ConfigDict(from_attributes=True)
+
     source: str
     log_message: str
     label: str
@@ -148,7 +315,6 @@ def home(request: Request) -> Response:
     start_time: float = time.time()
 
     try:
-        update_system_metrics()
         response: Response = templates.TemplateResponse(
             request=request, name="index.html", context={"result": None}
         )
@@ -164,6 +330,9 @@ async def predict(request: Request, file: UploadFile = File(...)) -> Response:
     """
     Handles CSV file upload, processes logs, and returns a page with results table and download link.
 
+    The labelled rows are embedded as JSON and the page builds the CSV download in
+    the browser, so no CSV is serialized on the server.
+
     Args:
         request (Request): The incoming HTTP request.
         file (UploadFile): The uploaded CSV file containing 'source' and 'log_message'.
@@ -174,12 +343,32 @@ async def predict(request: Request, file: UploadFile = File(...)) -> Response:
     REQUEST_COUNT.labels(method="POST", endpoint="/predict").inc()
     t0: float = time.time()
 
-    try:
-        # Read the uploaded file into a DataFrame
-        contents = await file.read()
-        df = pd.read_csv(io.StringIO(contents.decode("utf-8")))
+    if classifier_error is not None:
+        return templates.TemplateResponse(
+            request=request,
+            name="index.html",
+            context={"error": f"Classifier failed to load: {classifier_error}"},
+            status_code=500,
+        )
 
-        if "source" not in df.columns or "log_message" not in df.columns:
+    if classifier is None:
+        return templates.TemplateResponse(
+            request=request,
+            name="index.html",
+            context={"error": "Classifier is warming up, please retry shortly."},
+            status_code=503,
+        )
+
+    try:
+        # Read the upload into a pooled buffer and parse it in place with Arrow
+        buffer: bytearray = _acquire_buffer()
+        try:
+            size: int = await asyncio.to_thread(_read_into_buffer, file.file, buffer)
+            table: pa.Table = _parse_csv(buffer, size)
+        finally:
+            _release_buffer(buffer)
+
+        if not set(table.column_names) >= {"source", "log_message"}:
             # Render error in template instead of raising text-only 400
             return templates.TemplateResponse(
                 request=request,
@@ -189,34 +378,27 @@ async def predict(request: Request, file: UploadFile = File(...)) -> Response:
                 },
             )
 
-        # Convert to list of dicts for batch processing
-        logs_data = df[["source", "log_message"]].to_dict("records")
-        labels = classifier.batch_classify(logs_data)
-
-        # Add labels to the DataFrame
-        df["label"] = labels
-
-        results = df.to_dict(orient="records")
+        sources: List[str] = table.column("source").to_pylist()
+        messages: List[str] = table.column("log_message").to_pylist()
+        labels: List[str] = await classifier.classify_columns_async(
+            sources, messages, limiter=CLASSIFY_SEMAPHORE
+        )
 
-        csv_buffer = io.StringIO()
-        df.to_csv(csv_buffer, index=False)
-        csv_content = csv_buffer.getvalue()
-        csv_data = base64.b64encode(csv_content.encode("utf-8")).decode("utf-8")
+        results: List[Dict[str, Any]] = table.append_column(
+            "label", pa.array(labels, type=pa.string())
+        ).to_pylist()
 
         t1: float = time.time()
 
         # Update metrics
-        for label in labels:
-            PREDICTION_COUNT.labels(prediction=str(label)).inc()
+        record_predictions(labels)
         REQUEST_LATENCY.labels(endpoint="/predict").observe(t1 - t0)
-        update_system_metrics()
 
         return templates.TemplateResponse(
             request=request,
             name="index.html",
             context={
                 "results": results,
-                "csv_data": csv_data,
                 "filename": "labelled_logs.csv",
                 "uploaded_filename": file.filename,
             },
@@ -232,23 +414,117 @@ async def predict(request: Request, file: UploadFile = File(...)) -> Response:
         )
 
 
+def _acquire_buffer() -> bytearray:
+    """
+    Takes an upload buffer from the pool, allocating a new one if the pool is empty.
+
+    Returns:
+        bytearray: A buffer of at least UPLOAD_BUFFER_SIZE bytes.
+    """
+    try:
+        return BUFFER_POOL.get_nowait()
+    except queue.Empty:
+        return bytearray(UPLOAD_BUFFER_SIZE)
+
+
+def _release_buffer(buffer: bytearray) -> None:
+    """
+    Returns an upload buffer to the pool, dropping it if it was grown past
+    UPLOAD_BUFFER_SIZE or the pool is already full.
+
+    Args:
+        buffer (bytearray): The buffer to return.
+    """
+    if len(buffer) != UPLOAD_BUFFER_SIZE:
+        # Keep one large upload from pinning its grown buffer for the worker's lifetime
+        return
+    try:
+        BUFFER_POOL.put_nowait(buffer)
+    except queue.Full:
+        pass
+
+
+def _read_into_buffer(stream: IO[bytes], buffer: bytearray) -> int:
+    """
+    Reads a stream into a reusable buffer in chunks, doubling the buffer when full.
+
+    Args:
+        stream (IO[bytes]): The binary stream to read, e.g. UploadFile.file.
+        buffer (bytearray): The destination buffer; grown in place if needed.
+
+    Returns:
+        int: The number of bytes read.
+    """
+    size: int = 0
+    while True:
+        if size == len(buffer):
+            buffer.extend(bytes(len(buffer)))
+
+        chunk: memoryview = memoryview(buffer)[size : size + UPLOAD_READ_CHUNK]
+        read: int = stream.readinto(chunk)
+        chunk.release()
+
+        if not read:
+            return size
+        size += read
+
+
+def _parse_csv(buffer: bytearray, size: int) -> pa.Table:
+    """
+    Parses the first `size` bytes of an upload buffer as CSV without copying them.
+
+    Arrow copies parsed values into its own memory, so the buffer can be reused
+    as soon as this returns.
+
+    Args:
+        buffer (bytearray): The buffer holding the uploaded file.
+        size (int): Number of valid bytes in the buffer.
+
+    Returns:
+        pa.Table: The parsed table with every column read as strings.
+    """
+    # Reading the header as a data row makes Arrow infer every column as text, so
+    # extra columns (e.g. timestamps) keep their original spelling and stay JSON-safe
+    table: pa.Table = pacsv.read_csv(
+        pa.BufferReader(pa.py_buffer(buffer)[:size]),
+        read_options=pacsv.ReadOptions(
+            block_size=8 << 20, autogenerate_column_names=True
+        ),
+    )
+    names: List[str] = [str(column[0].as_py()) for column in table.columns]
+    return (
+        table.slice(1)
+        .rename_columns(names)
+        .cast(pa.schema([pa.field(name, pa.string()) for name in names]))
+    )
+
+
 @app.get("/metrics")
 def metrics() -> Response:
     """
     Exposes Prometheus metrics for scraping.
 
+    The rendered output is cached for METRICS_CACHE_TTL seconds; concurrent scrapes
+    wait on a lock and share a single regeneration.
+
     Returns:
         Response: The current metrics registry in Prometheus text format.
     """
-    update_system_metrics()
-    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    with _metrics_lock:
+        now: float = time.monotonic()
+        if now - _metrics_cache["ts"] > METRICS_CACHE_TTL:
+            _metrics_cache["body"] = generate_latest(registry)
+            _metrics_cache["ts"] = now
+        body: bytes = _metrics_cache["body"]
+
+    return Response(body, media_type=CONTENT_TYPE_LATEST)
 
 
 # --- API Endpoints ---
 
 
 @app.post("/classify", response_model=LogResponse)
-def classify_log_api(request: LogRequest) -> LogResponse:
+async def classify_log_api(request: LogRequest) -> LogResponse:
     """
     API endpoint to classify a single log message.
 
@@ -259,17 +535,21 @@ def classify_log_api(request: LogRequest) -> LogResponse:
         LogResponse: The classification result.
 
     Raises:
-        HTTPException: If an error occurs during classification.
+        HTTPException: 503 while the models are loading, 500 if classification fails.
     """
     REQUEST_COUNT.labels(method="POST", endpoint="/classify").inc()
     t0: float = time.time()
+    log_classifier: LogClassifier = get_classifier()
     try:
-        label: str = classifier.classify_message(request.source, request.log_message)
+        label: str = await log_classifier.classify_message_async(
+            request.source, request.log_message, limiter=CLASSIFY_SEMAPHORE
+        )
 
-        PREDICTION_COUNT.labels(prediction=str(label)).inc()
+        record_predictions([label])
         REQUEST_LATENCY.labels(endpoint="/classify").observe(time.time() - t0)
 
-        return LogResponse(
+        # Fields are already validated, so skip re-validation on the way out
+        return LogResponse.model_construct(
             source=request.source, log_message=request.log_message, label=label
         )
     except Exception as e:
@@ -278,7 +558,7 @@ def classify_log_api(request: LogRequest) -> LogResponse:
 
 
 @app.post("/classify/batch", response_model=BatchLogResponse)
-def classify_batch_logs_api(request: BatchLogRequest) -> BatchLogResponse:
+async def classify_batch_logs_api(request: BatchLogRequest) -> BatchLogResponse:
     """
     API endpoint to classify a batch of log messages.
 
@@ -289,30 +569,101 @@ def classify_batch_logs_api(request: BatchLogRequest) -> BatchLogResponse:
         BatchLogResponse: A list of classification results.
 
     Raises:
-        HTTPException: If an error occurs during processing.
+        HTTPException: 503 while the models are loading, 500 if processing fails.
     """
     REQUEST_COUNT.labels(method="POST", endpoint="/classify/batch").inc()
     t0: float = time.time()
+    log_classifier: LogClassifier = get_classifier()
     try:
-        # Convert Pydantic models to dicts for the classifier
-        logs_data: List[dict] = [log.model_dump() for log in request.logs]
-        labels: List[str] = classifier.batch_classify(logs_data)
+        # Pass parallel columns to the classifier instead of per-log dicts
+        sources: List[str] = [log.source for log in request.logs]
+        messages: List[str] = [log.log_message for log in request.logs]
+        labels: List[str] = await log_classifier.classify_columns_async(
+            sources, messages, limiter=CLASSIFY_SEMAPHORE
+        )
+
+        record_predictions(labels)
 
         results: List[LogResponse] = []
         for log, label in zip(request.logs, labels):
-            PREDICTION_COUNT.labels(prediction=str(label)).inc()
             results.append(
-                LogResponse(source=log.source, log_message=log.log_message, label=label)
+                LogResponse.model_construct(
+                    source=log.source, log_message=log.log_message, label=label
+                )
             )
 
         REQUEST_LATENCY.labels(endpoint="/classify/batch").observe(time.time() - t0)
-        return BatchLogResponse(results=results)
+        return BatchLogResponse.model_construct(results=results)
 
     except Exception as e:
         ERROR_COUNT.labels(type=type(e).__name__).inc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/classify/stream")
+async def classify_stream_logs_api(request: BatchLogRequest) -> StreamingResponse:
+    """
+    API endpoint to classify a batch of log messages, streaming each result as it is ready.
+
+    Results are sent as Server-Sent Events, one `{"index": ..., "label": ...}` JSON
+    object per log, so regex and BERT labels arrive before slower LLM ones.
+
+    Args:
+        request (BatchLogRequest): The JSON body containing a list of logs.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` of classification results.
+
+    Raises:
+        HTTPException: 503 while the models are loading.
+    """
+    REQUEST_COUNT.labels(method="POST", endpoint="/classify/stream").inc()
+    t0: float = time.time()
+    log_classifier: LogClassifier = get_classifier()
+
+    async def events() -> AsyncIterator[bytes]:
+        labels: List[str] = []
+        try:
+            async for index, label in log_classifier.stream_classify_columns(
+                [log.source for log in request.logs],
+                [log.log_message for log in request.logs],
+                limiter=CLASSIFY_SEMAPHORE,
+            ):
+                labels.append(label)
+                yield b"data: " + orjson.dumps(
+                    {"index": index, "label": label}
+                ) + b"\n\n"
+
+            REQUEST_LATENCY.labels(endpoint="/classify/stream").observe(
+                time.time() - t0
+            )
+
+        except Exception as e:
+            # Headers are already sent, so report the failure as a final error event
+            ERROR_COUNT.labels(type=type(e).__name__).inc()
+            yield b"event: error\ndata: " + orjson.dumps({"detail": str(e)}) + b"\n\n"
+
+        finally:
+            # One metrics update per request, covering every label that was streamed
+            record_predictions(labels)
+
+    # text/event-stream is never buffered by GZipMiddleware
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 if __name__ == "__main__":
     print("Starting FastAPI app...", flush=True)
-    uvicorn.run("app.app:app", host="0.0.0.0", port=8000, reload=True)
+    if os.getenv("VIGILIS_RELOAD") == "1":
+        # Development mode: single worker with auto-reload.
+        uvicorn.run("app.app:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        uvicorn.run(
+            "app.app:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+            limit_concurrency=1000,
+            timeout_keep_alive=30,
+        )
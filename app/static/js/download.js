@@ -0,0 +1,32 @@
+// Builds the labelled CSV in the browser from the rows embedded in the results page.
+
+function csvEscape(value) {
+    if (value === null || value === undefined) {
+        return "";
+    }
+    const text = String(value);
+    return /[",\r\n]/.test(text) ? '"' + text.replace(/"/g, '""') + '"' : text;
+}
+
+function toCSV(rows) {
+    if (!rows.length) {
+        return "";
+    }
+    const columns = Object.keys(rows[0]);
+    const lines = [columns.map(csvEscape).join(",")];
+    for (const row of rows) {
+        lines.push(columns.map((column) => csvEscape(row[column])).join(","));
+    }
+    return lines.join("\n") + "\n";
+}
+
+document.addEventListener("DOMContentLoaded", function () {
+    const data = document.getElementById("results-data");
+    const link = document.getElementById("download-link");
+    if (!data || !link) {
+        return;
+    }
+
+    const csv = toCSV(JSON.parse(data.textContent));
+    link.href = URL.createObjectURL(new Blob([csv], { type: "text/csv" }));
+});
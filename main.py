@@ -1,6 +1,9 @@
+import asyncio
+import contextlib
 import pandas as pd
-from typing import List, Dict
-from processors.regex_processing import RegexProcessor
+from dotenv import load_dotenv
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from processors.regex_processing import DEFAULT_PROCESSOR, RegexProcessor
 from processors.bert_processing import BertProcessor
 from processors.llm_processing import LlmProcessor
 
@@ -11,10 +14,11 @@ class LogClassifier:
 
     Responsibilities:
         - Initialize specific processors (Regex, BERT, LLM).
-        - Implement a tiered classification strategy:
-            1. Use LLM for specific sources (e.g., LegacyCRM).
-            2. Try Regex matching for known patterns.
-            3. Fallback to BERT classification for semantic understanding.
+        - Implement a tiered classification strategy, each tier only seeing what the
+          previous ones left unresolved:
+            1. Try Regex matching for known patterns.
+            2. Fallback to BERT classification for semantic understanding.
+            3. Ask the LLM about messages BERT is not confident on.
         - Process batches of logs from CSV files.
         - Generate and save labelled datasets.
     """
@@ -23,7 +27,7 @@ class LogClassifier:
         """
         Initializes the LogClassifier by instantiating the specific processors.
         """
-        self.regex_processor: RegexProcessor = RegexProcessor()
+        self.regex_processor: RegexProcessor = DEFAULT_PROCESSOR
         self.bert_processor: BertProcessor = BertProcessor()
         self.llm_processor: LlmProcessor = LlmProcessor()
 
@@ -58,13 +62,187 @@ class LogClassifier:
         Returns:
             List[str]: A list of classification labels corresponding to the input logs.
         """
-        import time
+        return self.batch_classify_columns(
+            [log["source"] for log in logs], [log["log_message"] for log in logs]
+        )
 
-        results = []
-        for log in logs:
-            results.append(self.classify_message(log["source"], log["log_message"]))
-            time.sleep(0.2)  # Slight delay to respect Rate Limits
-        return results
+    def classify_locally(self, messages: List[str]) -> List[str]:
+        """
+        Classifies log messages with the regex and BERT layers only.
+
+        Runs the regex layer over every message and sends the unmatched ones
+        through BERT in a single batched pass.
+
+        Args:
+            messages (List[str]): The log message contents.
+
+        Returns:
+            List[str]: One label per message; "Unclassified" where only the LLM can decide.
+        """
+        labels: List[Optional[str]] = [
+            self.regex_processor.classify(message=message) for message in messages
+        ]
+
+        unresolved: List[int] = [i for i, label in enumerate(labels) if not label]
+        bert_labels: List[str] = self.bert_processor.classify_batch(
+            [messages[i] for i in unresolved]
+        )
+        for i, label in zip(unresolved, bert_labels):
+            labels[i] = label
+
+        return labels
+
+    def batch_classify_columns(
+        self, sources: List[str], messages: List[str]
+    ) -> List[str]:
+        """
+        Classifies a batch of log messages given as parallel source and message columns.
+
+        Runs the regex layer over every log, sends the unmatched messages through
+        BERT in a single batched pass, and only calls the LLM for what remains,
+        packing several messages into each request and issuing those concurrently.
+
+        Blocks while the LLM requests run on the shared LLM event loop; async
+        callers should use `classify_columns_async` instead.
+
+        Args:
+            sources (List[str]): The source system of each log.
+            messages (List[str]): The log message contents, aligned with `sources`.
+
+        Returns:
+            List[str]: A list of classification labels corresponding to the input logs.
+        """
+        # Classify each distinct message once; log streams are highly repetitive
+        unique_messages: List[str] = list(dict.fromkeys(messages))
+        labels: List[str] = self.classify_locally(unique_messages)
+
+        remaining: List[int] = [
+            i for i, label in enumerate(labels) if label == "Unclassified"
+        ]
+        if remaining:
+            llm_labels: List[str] = self.llm_processor.run(
+                self.llm_processor.classify_marshalled_async(
+                    [unique_messages[i] for i in remaining]
+                )
+            )
+            for i, label in zip(remaining, llm_labels):
+                labels[i] = label
+
+        labels_by_message: Dict[str, str] = dict(zip(unique_messages, labels))
+        return [labels_by_message[message] for message in messages]
+
+    async def classify_message_async(
+        self,
+        src: str,
+        message: str,
+        limiter: Optional[asyncio.Semaphore] = None,
+    ) -> str:
+        """
+        Asynchronously classifies a single log message based on its source and content.
+
+        Only the CPU-bound regex and BERT pass runs under `limiter`; the LLM request,
+        if one is needed, is awaited after it has been released.
+
+        Args:
+            src (str): The source system of the log.
+            message (str): The log message content.
+            limiter (Optional[asyncio.Semaphore]): Held while the CPU-bound regex and BERT pass runs.
+
+        Returns:
+            str: The determined classification label.
+        """
+        async with limiter or contextlib.nullcontext():
+            label: str = (await asyncio.to_thread(self.classify_locally, [message]))[0]
+
+        if label != "Unclassified":
+            return label
+
+        return await self.llm_processor.run_async(
+            self.llm_processor.classify_async(message)
+        )
+
+    async def classify_columns_async(
+        self,
+        sources: List[str],
+        messages: List[str],
+        limiter: Optional[asyncio.Semaphore] = None,
+    ) -> List[str]:
+        """
+        Asynchronously classifies a batch of log messages given as parallel columns.
+
+        Works like `batch_classify_columns`, but only the CPU-bound regex and BERT pass
+        runs under `limiter`, so requests waiting on the LLM don't hold back others.
+
+        Args:
+            sources (List[str]): The source system of each log.
+            messages (List[str]): The log message contents, aligned with `sources`.
+            limiter (Optional[asyncio.Semaphore]): Held while the CPU-bound regex and BERT pass runs.
+
+        Returns:
+            List[str]: A list of classification labels corresponding to the input logs.
+        """
+        unique_messages: List[str] = list(dict.fromkeys(messages))
+        async with limiter or contextlib.nullcontext():
+            labels: List[str] = await asyncio.to_thread(
+                self.classify_locally, unique_messages
+            )
+
+        remaining: List[int] = [
+            i for i, label in enumerate(labels) if label == "Unclassified"
+        ]
+        if remaining:
+            llm_labels: List[str] = await self.llm_processor.run_async(
+                self.llm_processor.classify_marshalled_async(
+                    [unique_messages[i] for i in remaining]
+                )
+            )
+            for i, label in zip(remaining, llm_labels):
+                labels[i] = label
+
+        labels_by_message: Dict[str, str] = dict(zip(unique_messages, labels))
+        return [labels_by_message[message] for message in messages]
+
+    async def stream_classify_columns(
+        self,
+        sources: List[str],
+        messages: List[str],
+        limiter: Optional[asyncio.Semaphore] = None,
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Classifies a batch of log messages, yielding each label as soon as it is known.
+
+        Labels resolved by the regex and BERT layers are yielded first; LLM labels
+        follow in the order their requests complete.
+
+        Args:
+            sources (List[str]): The source system of each log.
+            messages (List[str]): The log message contents, aligned with `sources`.
+            limiter (Optional[asyncio.Semaphore]): Held while the CPU-bound regex and BERT pass runs.
+
+        Yields:
+            Tuple[int, str]: The position of a log in the input and its classification label.
+        """
+        positions: Dict[str, List[int]] = {}
+        for i, message in enumerate(messages):
+            positions.setdefault(message, []).append(i)
+        unique_messages: List[str] = list(positions)
+
+        async with limiter or contextlib.nullcontext():
+            labels: List[str] = await asyncio.to_thread(
+                self.classify_locally, unique_messages
+            )
+
+        remaining: List[str] = []
+        for message, label in zip(unique_messages, labels):
+            if label == "Unclassified":
+                remaining.append(message)
+                continue
+            for i in positions[message]:
+                yield i, label
+
+        async for message, label in self.llm_processor.classify_as_completed(remaining):
+            for i in positions[message]:
+                yield i, label
 
     def generate_labelled_logs(
         self, logs_dirpath: str, output_path: str = "./artifacts/labelled_logs.csv"
@@ -82,8 +260,9 @@ class LogClassifier:
         """
         df: pd.DataFrame = pd.read_csv(logs_dirpath)
 
-        logs: List[Dict[str, str]] = df[["source", "log_message"]].to_dict("records")
-        df["label"] = self.batch_classify(logs)
+        df["label"] = self.batch_classify_columns(
+            df["source"].tolist(), df["log_message"].tolist()
+        )
 
         df.to_csv(output_path, index=False)
 
@@ -100,4 +279,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    load_dotenv()
     main()
@@ -1,17 +1,172 @@
+import json
 import pickle
 from pathlib import Path
 from typing import Any, Dict, List
+import numpy as np
 from numpy import ndarray
 import sys
 import os
 
-# Add project root to sys.path to allow running this script directly
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+if __name__ == "__main__":
+    # Add project root to sys.path to allow running this script directly
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from sentence_transformers import SentenceTransformer
 
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+try:
+    from transformers import AutoTokenizer
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+except ImportError:
+    AutoTokenizer = None
+    ORTModelForFeatureExtraction = None
+
+
+from utils.logger import get_logger
+from utils.cache import LRUCache, MISSING
+
+# all-MiniLM-L6-v2 truncates at 256 word pieces, below its tokenizer's 512 limit.
+DEFAULT_MAX_SEQ_LENGTH: int = 256
+
 
-from utils.logger import logging
+class OnnxSentenceEncoder:
+    """
+    Int8-quantized ONNX Runtime replacement for the all-MiniLM-L6-v2 SentenceTransformer.
+
+    Responsibilities:
+        - Load the quantized export produced by `processors/onnx_export.py`.
+        - Tokenize, run the encoder, mean-pool over the attention mask and L2-normalize,
+          mirroring the SentenceTransformer pipeline.
+        - Expose the same `encode` signature used by BertProcessor.
+    """
+
+    def __init__(
+        self, model_dir: Path, file_name: str = "model_quantized.onnx"
+    ) -> None:
+        """
+        Initializes the encoder from a directory containing the quantized model and tokenizer.
+
+        The truncation length is read from the exported `sentence_bert_config.json`,
+        falling back to DEFAULT_MAX_SEQ_LENGTH, so long logs are cut where the
+        SentenceTransformer the classifier was trained on cuts them.
+
+        Args:
+            model_dir (Path): Directory holding the ONNX model and tokenizer files.
+            file_name (str): Name of the ONNX model file inside `model_dir`.
+        """
+        config_path: Path = Path(model_dir) / "sentence_bert_config.json"
+        self.max_seq_length: int = (
+            json.loads(config_path.read_text()).get(
+                "max_seq_length", DEFAULT_MAX_SEQ_LENGTH
+            )
+            if config_path.exists()
+            else DEFAULT_MAX_SEQ_LENGTH
+        )
+
+        session_options = ort.SessionOptions()
+        session_options.intra_op_num_threads = os.cpu_count() or 1
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_dir,
+            file_name=file_name,
+            provider="CPUExecutionProvider",
+            session_options=session_options,
+        )
+
+    def encode(
+        self, sentences: List[str], batch_size: int = 64, **kwargs: Any
+    ) -> ndarray:
+        """
+        Generates L2-normalized sentence embeddings.
+
+        Args:
+            sentences (List[str]): The texts to embed.
+            batch_size (int): Number of texts run through the model per call.
+            **kwargs: Accepted for SentenceTransformer compatibility and ignored.
+
+        Returns:
+            ndarray: A (len(sentences), dim) float32 array of embeddings.
+        """
+        batches: List[ndarray] = []
+        for start in range(0, len(sentences), batch_size):
+            encoded = self.tokenizer(
+                sentences[start : start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            hidden: ndarray = self.model(**encoded).last_hidden_state
+
+            mask: ndarray = encoded["attention_mask"][..., None].astype(hidden.dtype)
+            pooled: ndarray = (hidden * mask).sum(axis=1) / np.clip(
+                mask.sum(axis=1), 1e-9, None
+            )
+            norms: ndarray = np.linalg.norm(pooled, axis=1, keepdims=True)
+            batches.append(pooled / np.clip(norms, 1e-12, None))
+
+        return np.concatenate(batches).astype(np.float32)
+
+
+class OnnxClassifier:
+    """
+    ONNX Runtime replacement for the pickled scikit-learn classifier.
+
+    Responsibilities:
+        - Load the classifier exported by `processors/onnx_export.py`.
+        - Expose the `classes_`, `predict_proba` and `predict` interface used by BertProcessor.
+    """
+
+    def __init__(self, model_path: Path) -> None:
+        """
+        Initializes an inference session for the exported classifier.
+
+        Args:
+            model_path (Path): Path to the classifier ONNX file.
+        """
+        session_options = ort.SessionOptions()
+        session_options.intra_op_num_threads = os.cpu_count() or 1
+
+        self.session = ort.InferenceSession(
+            str(model_path), session_options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name: str = self.session.get_inputs()[0].name
+        self.proba_name: str = self.session.get_outputs()[1].name
+        self.classes_: ndarray = np.array(
+            json.loads(self.session.get_modelmeta().custom_metadata_map["classes"])
+        )
+
+    def predict_proba(self, embeddings: ndarray) -> ndarray:
+        """
+        Computes class probabilities for a batch of embeddings.
+
+        Args:
+            embeddings (ndarray): A (n, dim) array of sentence embeddings.
+
+        Returns:
+            ndarray: A (n, n_classes) array of probabilities ordered like `classes_`.
+        """
+        return self.session.run(
+            [self.proba_name],
+            {self.input_name: np.asarray(embeddings, dtype=np.float32)},
+        )[0]
+
+    def predict(self, embeddings: ndarray) -> ndarray:
+        """
+        Predicts the most likely class for a batch of embeddings.
+
+        Args:
+            embeddings (ndarray): A (n, dim) array of sentence embeddings.
+
+        Returns:
+            ndarray: The predicted class value for each embedding.
+        """
+        return self.classes_[self.predict_proba(embeddings).argmax(axis=1)]
 
 
 class BertProcessor:
@@ -19,10 +174,11 @@ class BertProcessor:
     Handles log classification using a pre-trained BERT model.
 
     Responsibilities:
-        - Load a pre-trained SentenceTransformer model and a classifier (pickled).
+        - Load a pre-trained SentenceTransformer model and a classifier (pickled or ONNX).
         - Generate embeddings for log messages.
         - Predict the category using the classifier and map it to a human-readable label.
         - Handle low-confidence predictions by returning 'Unclassified'.
+        - Cache labels per message so repeated log lines skip the forward pass.
     """
 
     def __init__(self) -> None:
@@ -36,37 +192,70 @@ class BertProcessor:
             3: "Resource Usage",
             4: "Security Alert",
         }
+        # Messages shorter than this (or without letters) skip the transformer
+        self.MIN_CHARS: int = 8
         self.transformer = None
         self.clf = None
+        self.cache: LRUCache = LRUCache(maxsize=100_000)
         self._load_models()
 
     def _load_models(self) -> None:
         """
-        Loads the SentenceTransformer and the pickled classifier.
+        Loads the sentence encoder and the classifier.
+
+        The int8 ONNX encoder is used when `models/minilm-int8` exists and ONNX Runtime
+        is installed; otherwise the FP32 SentenceTransformer is loaded. Likewise the
+        classifier is served from `models/clf.onnx` when present, falling back to the
+        pickled scikit-learn model.
 
         Raises:
-            FileNotFoundError: If the model pickle file does not exist.
+            FileNotFoundError: If neither classifier file exists.
             Exception: If loading the models fails.
         """
         try:
             models_dir: Path = Path(__file__).parent.parent / "models"
             model_path: Path = models_dir / "model.pkl"
+            clf_onnx_path: Path = models_dir / "clf.onnx"
+            use_onnx_clf: bool = ort is not None and clf_onnx_path.is_file()
 
-            if not model_path.exists():
-                logging.error(f"Model file not found at {model_path}")
+            if not use_onnx_clf and not model_path.exists():
+                get_logger(__name__).error(f"Model file not found at {model_path}")
                 raise FileNotFoundError(f"Model file not found at {model_path}")
 
-            self.transformer: SentenceTransformer = SentenceTransformer(
-                "all-MiniLM-L6-v2"
-            )
+            onnx_dir: Path = models_dir / "minilm-int8"
+            if ORTModelForFeatureExtraction is not None and onnx_dir.is_dir():
+                self.transformer = OnnxSentenceEncoder(onnx_dir)
+            else:
+                self.transformer = SentenceTransformer("all-MiniLM-L6-v2")
 
-            with open(model_path, "rb") as f:
-                self.clf: Any = pickle.load(f)
+            if use_onnx_clf:
+                self.clf: Any = OnnxClassifier(clf_onnx_path)
+            else:
+                with open(model_path, "rb") as f:
+                    self.clf = pickle.load(f)
 
         except Exception as e:
-            logging.error(f"Failed to load BERT models: {str(e)}", exc_info=True)
+            get_logger(__name__).error(
+                f"Failed to load BERT models: {str(e)}", exc_info=True
+            )
             raise e
 
+    def _is_trivial(self, message: str) -> bool:
+        """
+        Checks whether a message is too short or lacks letters to be worth encoding.
+
+        Args:
+            message (str): The log message string to check; non-strings such as a NaN
+                cell from pandas count as trivial.
+
+        Returns:
+            bool: True if the message should be left "Unclassified" without a forward pass.
+        """
+        if not isinstance(message, str):
+            return True
+        stripped: str = message.strip()
+        return len(stripped) < self.MIN_CHARS or not any(c.isalpha() for c in stripped)
+
     def classify(self, message: str) -> str:
         """
         Analyzes a log message using a BERT-based classifier to determine its category.
@@ -81,9 +270,13 @@ class BertProcessor:
             Exception: Captures and logs any unexpected errors during processing.
         """
         try:
-            if not self.transformer or not self.clf:
+            if not self.transformer or not self.clf or self._is_trivial(message):
                 return "Unclassified"
 
+            cached: str = self.cache.get(message)
+            if cached is not MISSING:
+                return cached
+
             # Encode the message to get embeddings
             embeddings: ndarray = self.transformer.encode(
                 [message], show_progress_bar=False
@@ -95,17 +288,86 @@ class BertProcessor:
 
             # Threshold for classification confidence
             if max_proba < 0.5:
-                return "Unclassified"
+                label: str = "Unclassified"
+            else:
+                # Get the predicted label index
+                label_index: str = self.clf.predict(embeddings)[0]
+                # Map index to label
+                label = self.LABEL_MAP.get(label_index, "Unclassified")
 
-            # Get the predicted label index
-            label_index: str = self.clf.predict(embeddings)[0]
-            # Map index to label
-            return self.LABEL_MAP.get(label_index, "Unclassified")
+            self.cache.put(message, label)
+            return label
 
         except Exception as e:
-            logging.info(f"Error in BertProcessor: {str(e)}", exc_info=True)
+            get_logger(__name__).info(
+                f"Error in BertProcessor: {str(e)}", exc_info=True
+            )
             return "Unclassified"
 
+    def classify_batch(self, messages: List[str]) -> List[str]:
+        """
+        Analyzes a batch of log messages with a single encoder and classifier pass.
+
+        Args:
+            messages (List[str]): The log message strings to analyze.
+
+        Returns:
+            List[str]: One label per message, "Unclassified" where confidence is below threshold.
+        """
+        if not messages:
+            return []
+
+        try:
+            if not self.transformer or not self.clf:
+                return ["Unclassified"] * len(messages)
+
+            labels_by_message: Dict[str, str] = {}
+            for message in messages:
+                if message in labels_by_message:
+                    continue
+                if self._is_trivial(message):
+                    labels_by_message[message] = "Unclassified"
+                    continue
+
+                cached: str = self.cache.get(message)
+                if cached is not MISSING:
+                    labels_by_message[message] = cached
+
+            # Encode each distinct uncached message once
+            pending: List[str] = [
+                message
+                for message in dict.fromkeys(messages)
+                if message not in labels_by_message
+            ]
+            if pending:
+                embeddings: ndarray = self.transformer.encode(
+                    pending,
+                    batch_size=64,
+                    convert_to_numpy=True,
+                    show_progress_bar=False,
+                )
+
+                proba: ndarray = self.clf.predict_proba(embeddings)
+                max_proba: ndarray = proba.max(axis=1)
+                label_indices: ndarray = self.clf.classes_[proba.argmax(axis=1)]
+
+                labels: List[str] = [
+                    self.LABEL_MAP.get(index, "Unclassified") for index in label_indices
+                ]
+                for message, label in zip(
+                    pending, np.where(max_proba < 0.5, "Unclassified", labels).tolist()
+                ):
+                    self.cache.put(message, label)
+                    labels_by_message[message] = label
+
+            return [labels_by_message[message] for message in messages]
+
+        except Exception as e:
+            get_logger(__name__).info(
+                f"Error in BertProcessor: {str(e)}", exc_info=True
+            )
+            return ["Unclassified"] * len(messages)
+
 
 def main() -> None:
     """
@@ -1,14 +1,129 @@
 import os
+import re
 import sys
-from typing import List
+import time
+import textwrap
+import asyncio
+import functools
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    TypeVar,
+)
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 from langchain_core.prompts import PromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.output_parsers import PydanticOutputParser, StrOutputParser
+
+if __name__ == "__main__":
+    # Add project root to sys.path to allow running this script directly
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.cache import LRUCache, MISSING
+
+T = TypeVar("T")
+
+# Static prompt scaffolding. Everything before the log message is identical across
+# calls, so the message goes last to keep the longest possible shared prefix for
+# server-side prompt caching. The text is dedented once at import time so indentation
+# is not sent, and billed, as prompt tokens.
+CATEGORY_INSTRUCTIONS: str = textwrap.dedent("""\
+    You are an expert system log analyzer.
+    Classify the following log message into one of these categories:
+    - User Action
+    - System Notification
+    - HTTP Status
+    - Critical Error
+    - Security Alert
+    - Error
+    - Resource Usage
+    - Workflow Error
+    - Configuration Error
+    - Dependency / Environment Issue
+    - Deprecation Warning
+    - Performance Warning
+    - Resource Exhaustion
+    - Security / Permission Issue
+    - Data / Input Error
+    - Informational / Status
+    - Miscellaneous
+
+    If the log does not fit well into any specific category, use "Miscellaneous".
+    """)
+PROMPT_PREFIX: str = CATEGORY_INSTRUCTIONS + textwrap.dedent("""
+    {parser_instructions}
+
+    Log Message:
+    """)
+MARSHALLED_PROMPT_PREFIX: str = CATEGORY_INSTRUCTIONS + textwrap.dedent("""
+    Each numbered line below is a separate log message. Classify every one of them
+    and output exactly one line per message, in order, formatted as
+    <label N>Category</label> where N is the message number.
+
+    Log Messages:
+    """)
+PROMPT_SUFFIX: str = "\n"
+
+
+# Compiled once at import time rather than looked up in re's cache on every response.
+# Category names never contain "<", so [^<]* bounds the label without lazy backtracking.
+LABEL_PATTERN: Pattern = re.compile(r"<label\s*(\d+)>([^<]*)</label>")
 
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-load_dotenv()
+
+# Started lazily by get_event_loop; the lock makes sure concurrent first callers from
+# worker threads all get the same loop.
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+_event_loop_lock: threading.Lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the process-wide event loop that runs every async LLM call, starting it on first use.
+
+    The async Gemini client binds its connection pool to the loop it first runs on, so
+    all async requests must go through one long-lived loop rather than a fresh
+    `asyncio.run` loop per batch. The loop runs in a daemon thread.
+
+    Returns:
+        asyncio.AbstractEventLoop: The shared, running event loop.
+    """
+    global _event_loop
+    if _event_loop is None:
+        with _event_loop_lock:
+            if _event_loop is None:
+                loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="llm-event-loop", daemon=True
+                ).start()
+                _event_loop = loop
+    return _event_loop
+
+
+@functools.cache
+def get_chat_model() -> ChatGoogleGenerativeAI:
+    """
+    Returns the process-wide Gemini chat model, creating it on first use.
+
+    The client holds the HTTP connection pool, so sharing it across LlmProcessor
+    instances keeps connections (and their TLS sessions) warm. A failed construction
+    is not cached and is retried on the next call.
+
+    Returns:
+        ChatGoogleGenerativeAI: The shared chat model.
+    """
+    # Labelling needs little reasoning; low thinking cuts the hidden tokens decoded
+    # before the answer, and a fixed seed keeps repeated runs reproducible.
+    return ChatGoogleGenerativeAI(
+        model="gemini-3-pro-preview", temperature=0, thinking_level="low", seed=0
+    )
 
 
 class LlmSchema(BaseModel):
@@ -20,66 +135,84 @@ class LlmProcessor:
     Handles log classification using Large Language Models provided by Google Gemini via LangChain.
 
     Responsibilities:
-        - Initialize the Google Generative AI client.
+        - Obtain the shared Google Generative AI client.
         - Construct a prompt with classification instructions and categories.
         - Send the prompt to the LLM and parse the response to extract the label.
         - Handle API errors and fall back to 'Unclassified'.
+        - Cache successful labels per message to avoid repeated API calls.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, requests_per_second: float = 5.0) -> None:
         """
         Initializes the LlmProcessor by setting up the Google Gemini client.
+
+        Args:
+            requests_per_second (float): Maximum rate of Gemini API calls issued by this processor.
         """
+        self._min_interval: float = 1.0 / requests_per_second
+        self._last_call: float = 0.0
+        self._rate_lock: threading.Lock = threading.Lock()
+        self.cache: LRUCache = LRUCache(maxsize=100_000)
+
         try:
             self.parser: PydanticOutputParser[LlmSchema] = PydanticOutputParser(
                 pydantic_object=LlmSchema
             )
 
             self.prompt = PromptTemplate(
-                template="""
-                You are an expert system log analyzer.
-                Classify the following log message into one of these categories:
-                - User Action
-                - System Notification
-                - HTTP Status
-                - Critical Error
-                - Security Alert
-                - Error
-                - Resource Usage
-                - Workflow Error
-                - Configuration Error
-                - Dependency / Environment Issue
-                - Deprecation Warning
-                - Performance Warning
-                - Resource Exhaustion
-                - Security / Permission Issue
-                - Data / Input Error
-                - Informational / Status
-                - Miscellaneous
-
-                If the log does not fit well into any specific category, use "Miscellaneous".
-
-                Log Message:
-                {message}
-
-                {parser_instructions}
-                """,
+                template=PROMPT_PREFIX + "{message}" + PROMPT_SUFFIX,
                 input_variables=["message"],
                 partial_variables={
                     "parser_instructions": self.parser.get_format_instructions()
                 },
             )
 
-            self.model = ChatGoogleGenerativeAI(
-                model="gemini-3-pro-preview", temperature=0
-            )
+            self.model: ChatGoogleGenerativeAI = get_chat_model()
 
             self.chain = self.prompt | self.model | self.parser
 
+            self.marshalled_prompt = PromptTemplate(
+                template=MARSHALLED_PROMPT_PREFIX + "{messages}" + PROMPT_SUFFIX,
+                input_variables=["messages"],
+            )
+
         except Exception as e:
             print(f"Error initializing LlmProcessor: {e}")
             self.model = None
 
+    def _reserve_slot(self) -> float:
+        """
+        Reserves the next API call slot allowed by the configured rate limit.
+
+        Slots are reserved under a lock so concurrent callers are spaced out
+        instead of all firing once the interval elapses.
+
+        Returns:
+            float: Seconds the caller must wait before issuing its request.
+        """
+        with self._rate_lock:
+            now: float = time.monotonic()
+            sleep_for: float = self._min_interval - (now - self._last_call)
+            self._last_call = now + max(sleep_for, 0.0)
+
+        return sleep_for
+
+    def _wait_for_slot(self) -> None:
+        """
+        Blocks until the next API call is allowed by the configured rate limit.
+        """
+        sleep_for: float = self._reserve_slot()
+        if sleep_for > 0:
+            time.sleep(sleep_for)
+
+    async def _await_slot(self) -> None:
+        """
+        Waits without blocking the event loop until the next API call is allowed.
+        """
+        sleep_for: float = self._reserve_slot()
+        if sleep_for > 0:
+            await asyncio.sleep(sleep_for)
+
     def classify(self, message: str) -> str:
         """
         Analyzes a log message using Google Gemini to determine its category.
@@ -96,14 +229,295 @@ class LlmProcessor:
         if not self.model:
             return "Unclassified"
 
+        cached: str = self.cache.get(message)
+        if cached is not MISSING:
+            return cached
+
+        self._wait_for_slot()
+
         try:
             response = self.chain.invoke({"message": message})
+            self.cache.put(message, response.label)
+            return response.label
+
+        except Exception as e:
+            print(f"Error classifying log: {e}")
+            return "Unclassified"
+
+    async def classify_async(self, message: str) -> str:
+        """
+        Asynchronously analyzes a log message using Google Gemini to determine its category.
+
+        Args:
+            message (str): The log message string to analyze.
+
+        Returns:
+            str: The extracted category label if successful, otherwise "Miscellaneous" or "Unclassified".
+        """
+        if not self.model:
+            return "Unclassified"
+
+        cached: str = self.cache.get(message)
+        if cached is not MISSING:
+            return cached
+
+        await self._await_slot()
+
+        try:
+            response = await self.chain.ainvoke({"message": message})
+            self.cache.put(message, response.label)
             return response.label
 
         except Exception as e:
             print(f"Error classifying log: {e}")
             return "Unclassified"
 
+    async def classify_many(
+        self, messages: List[str], max_concurrency: int = 8
+    ) -> List[str]:
+        """
+        Classifies several log messages with concurrent Gemini requests.
+
+        Args:
+            messages (List[str]): The log message strings to analyze.
+            max_concurrency (int): Maximum number of requests in flight at once.
+
+        Returns:
+            List[str]: One label per message, in input order.
+        """
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def classify_one(message: str) -> str:
+            async with semaphore:
+                return await self.classify_async(message)
+
+        # Issue one request per distinct message
+        unique_messages: List[str] = list(dict.fromkeys(messages))
+        # An unexpected failure in one request must not cancel the rest of the batch
+        results: List[object] = await asyncio.gather(
+            *(classify_one(m) for m in unique_messages), return_exceptions=True
+        )
+        labels_by_message: Dict[str, str] = {
+            message: "Unclassified" if isinstance(result, BaseException) else result
+            for message, result in zip(unique_messages, results)
+        }
+        return [labels_by_message[m] for m in messages]
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Runs a coroutine on the shared LLM event loop and blocks until it finishes.
+
+        Must not be called from the LLM event loop itself.
+
+        Args:
+            coro (Coroutine): The coroutine to run, e.g. `classify_marshalled_async(...)`.
+
+        Returns:
+            T: The coroutine's result.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+    async def run_async(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Awaits a coroutine from any event loop while running it on the shared LLM loop.
+
+        Args:
+            coro (Coroutine): The coroutine to run.
+
+        Returns:
+            T: The coroutine's result.
+        """
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+        )
+
+    async def classify_as_completed(
+        self, messages: List[str], k: int = 8, max_concurrency: int = 8
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Classifies several log messages concurrently, yielding labels as soon as they arrive.
+
+        Messages are marshalled `k` to a request as in `classify_marshalled_async`, and
+        each request's labels are yielded together when it completes.
+
+        Args:
+            messages (List[str]): The log message strings to analyze.
+            k (int): Maximum number of messages per request.
+            max_concurrency (int): Maximum number of requests in flight at once.
+
+        Yields:
+            Tuple[str, str]: A (message, label) pair per distinct message, in completion order.
+        """
+        pending: List[str] = []
+        for message in dict.fromkeys(messages):
+            if not isinstance(message, str):
+                # Empty cells (e.g. NaN from pandas) have nothing to classify
+                yield message, "Unclassified"
+                continue
+            cached: str = self.cache.get(message)
+            if cached is MISSING:
+                pending.append(message)
+            else:
+                yield message, cached
+
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def classify_chunk(chunk: List[str]) -> Dict[str, str]:
+            async with semaphore:
+                try:
+                    return await self._classify_chunk_async(chunk)
+                except Exception:
+                    return dict.fromkeys(chunk, "Unclassified")
+
+        # The requests run on the shared LLM loop; this loop only awaits their results
+        tasks: List[asyncio.Future] = [
+            asyncio.ensure_future(
+                self.run_async(classify_chunk(pending[start : start + k]))
+            )
+            for start in range(0, len(pending), k)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for message, label in (await next_done).items():
+                    yield message, label
+        finally:
+            # Stop outstanding requests if the consumer goes away early
+            for task in tasks:
+                task.cancel()
+
+    def _marshalled_chain(self, k: int):
+        """
+        Builds the chain used to label `k` marshalled log messages in one request.
+
+        Args:
+            k (int): Number of log messages packed into the prompt.
+
+        Returns:
+            Runnable: Prompt, model stopped before any label past the k-th, and a string parser.
+        """
+        # Gemini counts thinking tokens against max_output_tokens, so a tight token cap
+        # could cut the answer off; stopping on the (k+1)-th label bounds decode instead.
+        return (
+            self.marshalled_prompt
+            | self.model.bind(stop=[f"<label {k + 1}>"])
+            | StrOutputParser()
+        )
+
+    async def _classify_chunk_async(self, chunk: List[str]) -> Dict[str, str]:
+        """
+        Labels one chunk of log messages with a single marshalled Gemini request.
+
+        Chunks whose response cannot be parsed into exactly one label per message
+        are retried one message at a time.
+
+        Args:
+            chunk (List[str]): Distinct, uncached log messages to label together.
+
+        Returns:
+            Dict[str, str]: The label of each message in the chunk.
+        """
+        # One message per numbered line, so embedded newlines are flattened
+        numbered: str = "\n".join(
+            f"{i}. {' '.join(message.splitlines())}"
+            for i, message in enumerate(chunk, start=1)
+        )
+
+        await self._await_slot()
+
+        try:
+            response: str = await self._marshalled_chain(len(chunk)).ainvoke(
+                {"messages": numbered}
+            )
+        except Exception as e:
+            print(f"Error classifying log batch: {e}")
+            return dict.fromkeys(chunk, "Unclassified")
+
+        parsed: Dict[int, str] = {
+            int(index): label.strip()
+            for index, label in LABEL_PATTERN.findall(response)
+        }
+
+        if sorted(parsed) != list(range(1, len(chunk) + 1)):
+            labels: List[str] = await asyncio.gather(
+                *(self.classify_async(message) for message in chunk)
+            )
+            return dict(zip(chunk, labels))
+
+        labels_by_message: Dict[str, str] = {}
+        for i, message in enumerate(chunk, start=1):
+            label: str = parsed[i] or "Miscellaneous"
+            self.cache.put(message, label)
+            labels_by_message[message] = label
+
+        return labels_by_message
+
+    async def classify_marshalled_async(
+        self, messages: List[str], k: int = 8, max_concurrency: int = 8
+    ) -> List[str]:
+        """
+        Classifies log messages by packing up to `k` of them into each Gemini request.
+
+        Every request pays for the shared instructions only once, so this needs about
+        k times fewer API calls than `classify_many`; the chunk requests are issued
+        concurrently.
+
+        Args:
+            messages (List[str]): The log message strings to analyze.
+            k (int): Maximum number of messages per request; gains flatten out past ~16.
+            max_concurrency (int): Maximum number of requests in flight at once.
+
+        Returns:
+            List[str]: One label per message, in input order.
+        """
+        if not self.model:
+            return ["Unclassified"] * len(messages)
+
+        labels_by_message: Dict[str, str] = {}
+        pending: List[str] = []
+        for message in dict.fromkeys(messages):
+            if not isinstance(message, str):
+                # Empty cells (e.g. NaN from pandas) would fail the whole chunk's prompt
+                labels_by_message[message] = "Unclassified"
+                continue
+            cached: str = self.cache.get(message)
+            if cached is MISSING:
+                pending.append(message)
+            else:
+                labels_by_message[message] = cached
+
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def classify_chunk(chunk: List[str]) -> Dict[str, str]:
+            async with semaphore:
+                return await self._classify_chunk_async(chunk)
+
+        chunks: List[List[str]] = [
+            pending[start : start + k] for start in range(0, len(pending), k)
+        ]
+        # An unexpected failure in one request must not cancel the rest of the batch
+        results: List[object] = await asyncio.gather(
+            *(classify_chunk(chunk) for chunk in chunks), return_exceptions=True
+        )
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                result = dict.fromkeys(chunk, "Unclassified")
+            labels_by_message.update(result)
+
+        return [labels_by_message[m] for m in messages]
+
+    def classify_marshalled(self, messages: List[str], k: int = 8) -> List[str]:
+        """
+        Blocking form of `classify_marshalled_async`, run on the shared LLM event loop.
+
+        Args:
+            messages (List[str]): The log message strings to analyze.
+            k (int): Maximum number of messages per request.
+
+        Returns:
+            List[str]: One label per message, in input order.
+        """
+        return self.run(self.classify_marshalled_async(messages, k=k))
+
 
 def main() -> None:
     """
@@ -188,4 +602,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    load_dotenv()
     main()
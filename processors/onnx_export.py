@@ -0,0 +1,132 @@
+import sys
+import os
+import json
+import pickle
+from pathlib import Path
+from typing import List, Optional
+
+if __name__ == "__main__":
+    # Add project root to sys.path to allow running this script directly
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+import onnxruntime as ort
+from transformers import AutoTokenizer
+from sentence_transformers import SentenceTransformer
+from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
+
+from utils.logger import get_logger
+
+MODEL_ID: str = "sentence-transformers/all-MiniLM-L6-v2"
+MODELS_DIR: Path = Path(__file__).parent.parent / "models"
+
+
+def export_encoder(
+    onnx_dir: Path = MODELS_DIR / "minilm-onnx",
+    int8_dir: Path = MODELS_DIR / "minilm-int8",
+) -> None:
+    """
+    Exports all-MiniLM-L6-v2 to ONNX and quantizes it to int8 for BertProcessor.
+
+    Equivalent to:
+        optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 \\
+            --task feature-extraction models/minilm-onnx/
+        optimum-cli onnxruntime quantize --onnx_model models/minilm-onnx \\
+            --avx512_vnni -o models/minilm-int8
+
+    Args:
+        onnx_dir (Path): Output directory for the FP32 ONNX export.
+        int8_dir (Path): Output directory for the quantized model and tokenizer.
+    """
+    model = ORTModelForFeatureExtraction.from_pretrained(MODEL_ID, export=True)
+    model.save_pretrained(onnx_dir)
+    get_logger(__name__).info(f"Exported ONNX encoder to {onnx_dir}")
+
+    quantizer = ORTQuantizer.from_pretrained(onnx_dir)
+    qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=int8_dir, quantization_config=qconfig)
+
+    AutoTokenizer.from_pretrained(MODEL_ID).save_pretrained(int8_dir)
+    # The encoder truncates where SentenceTransformer does, not at the tokenizer limit
+    (int8_dir / "sentence_bert_config.json").write_text(
+        json.dumps({"max_seq_length": SentenceTransformer(MODEL_ID).max_seq_length})
+    )
+    get_logger(__name__).info(f"Saved int8 encoder to {int8_dir}")
+
+
+def export_classifier(
+    model_path: Path = MODELS_DIR / "model.pkl",
+    onnx_path: Path = MODELS_DIR / "clf.onnx",
+    sample_messages: Optional[List[str]] = None,
+) -> None:
+    """
+    Converts the pickled scikit-learn classifier to ONNX for BertProcessor.
+
+    Probabilities are emitted as a plain tensor (no ZipMap) and the class values are
+    stored in the model metadata under "classes". When sample messages are given,
+    the exported model is checked against the pickled one on their embeddings.
+
+    Args:
+        model_path (Path): Path to the pickled classifier.
+        onnx_path (Path): Output path for the ONNX classifier.
+        sample_messages (Optional[List[str]]): Log messages used to validate the export.
+    """
+    with open(model_path, "rb") as f:
+        clf = pickle.load(f)
+
+    onx = convert_sklearn(
+        clf,
+        initial_types=[("X", FloatTensorType([None, clf.n_features_in_]))],
+        options={id(clf): {"zipmap": False}},
+    )
+    classes = onx.metadata_props.add()
+    classes.key = "classes"
+    classes.value = json.dumps(clf.classes_.tolist())
+
+    onnx_path.write_bytes(onx.SerializeToString())
+    get_logger(__name__).info(f"Saved ONNX classifier to {onnx_path}")
+
+    if sample_messages:
+        embeddings: np.ndarray = SentenceTransformer("all-MiniLM-L6-v2").encode(
+            sample_messages, show_progress_bar=False
+        )
+        session = ort.InferenceSession(
+            onx.SerializeToString(), providers=["CPUExecutionProvider"]
+        )
+        onnx_proba: np.ndarray = session.run(
+            None, {"X": embeddings.astype(np.float32)}
+        )[1]
+        sklearn_proba: np.ndarray = clf.predict_proba(embeddings)
+
+        max_diff: float = float(np.abs(onnx_proba - sklearn_proba).max())
+        agreement: float = float(
+            (onnx_proba.argmax(axis=1) == sklearn_proba.argmax(axis=1)).mean()
+        )
+        get_logger(__name__).info(
+            f"ONNX classifier check: max |dp| = {max_diff:.2e}, "
+            f"label agreement = {agreement:.1%}"
+        )
+        if agreement < 1.0:
+            get_logger(__name__).warning(
+                "ONNX classifier disagrees with the pickled model on sample logs; "
+                f"delete {onnx_path} to keep using model.pkl."
+            )
+
+
+def main() -> None:
+    """
+    Main function to generate the ONNX models used by BertProcessor.
+    """
+    export_encoder()
+
+    sample_path: Path = Path(__file__).parent.parent / "artifacts" / "test.csv"
+    sample_messages: List[str] = pd.read_csv(sample_path)["log_message"].tolist()
+    export_classifier(sample_messages=sample_messages)
+
+
+if __name__ == "__main__":
+    main()
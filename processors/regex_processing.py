@@ -1,12 +1,73 @@
 import re
 import sys
 import os
+import functools
 
-# Add project root to sys.path to allow running this script directly
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
-from utils.logger import logging
-from typing import Optional, List, Tuple, Pattern
+if __name__ == "__main__":
+    # Add project root to sys.path to allow running this script directly
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+from utils.logger import get_logger
+from typing import Callable, Optional, List, Tuple, Pattern, Dict
+
+# Anchored (pattern, label) rules keyed by the lowercased first word of the messages
+# they can match. Rules sharing a leading word and label are fused into one alternation
+# under a single ^...\.$ anchor, so a message is checked against at most one pattern
+# and the shared prefix and suffix are matched once.
+ANCHORED_RULES: Dict[str, Tuple[str, str]] = {
+    "user": (
+        r"^(?:User User\d+ logged (?:in|out)|(?i:User login successful))\.$",
+        "USER_ACTION",
+    ),
+    "account": (r"^Account with ID \d+ created by User\d+\.$", "USER_ACTION"),
+    "backup": (
+        r"^Backup (?:(?:started|ended) at \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}"
+        r"|completed successfully)\.$",
+        "SYSTEM_NOTIFICATION",
+    ),
+    "system": (
+        r"^System (?:updated to version \d+\.\d+\.\d+"
+        r"|reboot initiated by user User\d+)\.$",
+        "SYSTEM_NOTIFICATION",
+    ),
+    "file": (
+        r"^File .+ uploaded successfully by user User\d+\.$",
+        "SYSTEM_NOTIFICATION",
+    ),
+    "disk": (r"^Disk cleanup completed successfully\.$", "SYSTEM_NOTIFICATION"),
+}
+
+# The only unanchored rule. It is kept separate so it does not defeat the prefix
+# fast path of the anchored groups, and it is tried last to preserve rule priority.
+# It is case-insensitive, so it is written in lowercase and matched against the message
+# lowercased once, rather than case-folding every character the engine compares.
+SECURITY_RULE: Tuple[str, str] = (
+    r"\b(?:unauthorized|failed login|blocked|suspicious)\b",
+    "SECURITY_ALERT",
+)
+
+# Compiled once at import time and shared by every RegexProcessor instance.
+COMPILED_RULES: Dict[str, Tuple[Pattern, str]] = {
+    word: (re.compile(pattern), label)
+    for word, (pattern, label) in ANCHORED_RULES.items()
+}
+# The security rule has no backreferences or lookaround, so when google-re2 is installed
+# it runs on RE2's linear-time automaton instead of the backtracking engine.
+SECURITY_PATTERN: Pattern = (re2 or re).compile(SECURITY_RULE[0])
+
+# Literal keywords of SECURITY_RULE. A lowercase substring scan for these is far cheaper
+# than the regex, which then only runs to confirm word boundaries.
+SECURITY_KEYWORDS: Tuple[str, ...] = (
+    "unauthorized",
+    "failed login",
+    "blocked",
+    "suspicious",
+)
 
 
 class RegexProcessor:
@@ -14,71 +75,42 @@ class RegexProcessor:
     Handles log classification using regular expression matching.
 
     Responsibilities:
-        - Maintain a prioritized list of regex patterns mapped to classification labels.
-        - Iterate through rules to find the first matching pattern for a given log message.
+        - Maintain anchored regex patterns mapped to classification labels, keyed by first word.
+        - Dispatch a log message on its first word to the one anchored rule it could match,
+          then fall back to the security rule.
+        - Cache results per message, since log streams repeat the same lines heavily.
         - Return 'USER_ACTION', 'SYSTEM_NOTIFICATION', or 'SECURITY_ALERT' based on matches.
     """
 
     def __init__(self):
         """
-        Initializes the RegexProcessor with a list of compiled regex rules.
+        Initializes the RegexProcessor with the module-level compiled regex rules.
         """
-        self.REGEX_RULES: List[Tuple[Pattern, str]] = [
-            (
-                re.compile(r"^User User\d+ logged (in|out)\.$"),
-                "USER_ACTION",
-            ),
-            (
-                re.compile(r"^Account with ID \d+ created by User\d+\.$"),
-                "USER_ACTION",
-            ),
-            (
-                re.compile(
-                    r"^Backup started at \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.$"
-                ),
-                "SYSTEM_NOTIFICATION",
-            ),
-            (
-                re.compile(r"^Backup ended at \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.$"),
-                "SYSTEM_NOTIFICATION",
-            ),
-            (
-                re.compile(r"^Backup completed successfully\.$"),
-                "SYSTEM_NOTIFICATION",
-            ),
-            (
-                re.compile(r"^System updated to version \d+\.\d+\.\d+\.$"),
-                "SYSTEM_NOTIFICATION",
-            ),
-            (
-                re.compile(r"^File .+ uploaded successfully by user User\d+\.$"),
-                "SYSTEM_NOTIFICATION",
-            ),
-            (
-                re.compile(r"^Disk cleanup completed successfully\.$"),
-                "SYSTEM_NOTIFICATION",
-            ),
-            (
-                re.compile(r"^System reboot initiated by user User\d+\.$"),
-                "SYSTEM_NOTIFICATION",
-            ),
-            (
-                re.compile(r"^User login successful\.$", re.I),
-                "USER_ACTION",
-            ),
-            (
-                re.compile(
-                    r"\bunauthorized\b|\bfailed login\b|\bblocked\b|\bsuspicious\b",
-                    re.I,
-                ),
-                "SECURITY_ALERT",
-            ),
-        ]
+        self.REGEX_RULES: Dict[str, Tuple[Pattern, str]] = COMPILED_RULES
+        # functools.lru_cache is implemented in C; a hit costs less than the rules
+        # themselves, which a lock-guarded Python LRU does not.
+        self.cached_classify: Callable[[str], Optional[str]] = functools.lru_cache(
+            maxsize=100_000
+        )(self._match)
 
     def classify(self, message: str) -> Optional[str]:
         """
         Analyzes a log message using regular expressions to determine its category.
 
+        Results are memoized per message.
+
+        Args:
+            message (str): The log message string to analyze.
+
+        Returns:
+            Optional[str]: The category label if a match is found, otherwise None.
+        """
+        return self.cached_classify(message)
+
+    def _match(self, message: str) -> Optional[str]:
+        """
+        Runs the regex rules against a log message, bypassing the result cache.
+
         Args:
             message (str): The log message string to analyze.
 
@@ -89,24 +121,49 @@ class RegexProcessor:
             Exception: Captures and logs any unexpected errors during processing.
         """
         try:
-            # Iterate through rules and return the first match
-            for pattern, label in self.REGEX_RULES:
-                if pattern.search(message):
-                    return label
+            label: Optional[str] = None
+            lowered: str = message.lower()
+            rule: Optional[Tuple[Pattern, str]] = self.REGEX_RULES.get(
+                lowered.partition(" ")[0]
+            )
 
-            return None
+            if rule and rule[0].match(message):
+                label = rule[1]
+            elif any(
+                keyword in lowered for keyword in SECURITY_KEYWORDS
+            ) and SECURITY_PATTERN.search(lowered):
+                label = SECURITY_RULE[1]
+
+            return label
 
         except Exception as e:
-            logging.info(f"Error in RegexProcessor: {str(e)}", exc_info=True)
+            get_logger(__name__).info(
+                f"Error in RegexProcessor: {str(e)}", exc_info=True
+            )
             return None
 
 
-def main() -> None:
+# Shared instance, so every caller reuses one result cache.
+DEFAULT_PROCESSOR: RegexProcessor = RegexProcessor()
+
+
+def classify(message: str) -> Optional[str]:
     """
-    Main function to test the RegexProcessor class with sample logs.
+    Classifies a log message with the shared module-level RegexProcessor.
+
+    Args:
+        message (str): The log message string to analyze.
+
+    Returns:
+        Optional[str]: The category label if a match is found, otherwise None.
     """
-    processor: RegexProcessor = RegexProcessor()
+    return DEFAULT_PROCESSOR.classify(message)
+
 
+def main() -> None:
+    """
+    Main function to test the shared RegexProcessor with sample logs.
+    """
     test_logs: List[str] = [
         "User User123 logged out.",
         "User User123 logged in.",
@@ -178,7 +235,7 @@ def main() -> None:
     ]
 
     for msg in test_logs:
-        result: str = processor.classify(msg)
+        result: str = classify(msg)
         print(f"'{msg}' -> {result}")
 
 
@@ -1,28 +1,42 @@
+import re
+import json
+import asyncio
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 import io
+import os
 from fastapi.testclient import TestClient
-from app.app import app, classifier
+import app.app as app_module
+from app.app import app
 
 
 class TestApp(unittest.TestCase):
     def setUp(self):
         self.client = TestClient(app)
-        self.original_classify_message = classifier.classify_message
-        self.original_batch_classify = classifier.batch_classify
+        self.original_classifier = app_module.classifier
+        self.original_classifier_error = app_module.classifier_error
 
-        classifier.classify_message = MagicMock(return_value="Mocked_Label")
-        classifier.batch_classify = MagicMock(return_value=["Mocked_Label"])
+        self.classifier = MagicMock()
+        self.classifier.classify_message_async = AsyncMock(return_value="Mocked_Label")
+        self.classifier.classify_columns_async = AsyncMock(
+            return_value=["Mocked_Label"]
+        )
+        app_module.classifier = self.classifier
 
     def tearDown(self):
-        classifier.classify_message = self.original_classify_message
-        classifier.batch_classify = self.original_batch_classify
+        app_module.classifier = self.original_classifier
+        app_module.classifier_error = self.original_classifier_error
 
     def test_home_page(self):
         response = self.client.get("/")
         self.assertEqual(response.status_code, 200)
         self.assertIn("Vigilis", response.text)
 
+    def test_process_handle_created_at_startup(self):
+        app_module.PROCESS = None
+        with TestClient(app):
+            self.assertEqual(app_module.PROCESS.pid, os.getpid())
+
     def test_classify_api(self):
         payload = {"source": "TestSrc", "log_message": "Test Message"}
         response = self.client.post("/classify", json=payload)
@@ -38,13 +52,46 @@ class TestApp(unittest.TestCase):
                 {"source": "S2", "log_message": "M2"},
             ]
         }
-        classifier.batch_classify.return_value = ["L1", "L2"]
+        self.classifier.classify_columns_async.return_value = ["L1", "L2"]
 
         response = self.client.post("/classify/batch", json=payload)
         self.assertEqual(response.status_code, 200)
         data = response.json()
         self.assertEqual(len(data["results"]), 2)
         self.assertEqual(data["results"][0]["label"], "L1")
+        self.classifier.classify_columns_async.assert_called_once_with(
+            ["S1", "S2"], ["M1", "M2"], limiter=app_module.CLASSIFY_SEMAPHORE
+        )
+
+    def test_classify_stream_api(self):
+        payload = {
+            "logs": [
+                {"source": "S1", "log_message": "M1"},
+                {"source": "S2", "log_message": "M2"},
+            ]
+        }
+
+        async def stream(sources, messages, limiter=None):
+            yield 1, "L2"
+            yield 0, "L1"
+
+        self.classifier.stream_classify_columns = stream
+
+        with patch.object(app_module, "record_predictions") as record_predictions:
+            response = self.client.post("/classify/stream", json=payload)
+        record_predictions.assert_called_once_with(["L2", "L1"])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            response.headers["content-type"].startswith("text/event-stream")
+        )
+        events = [
+            json.loads(line[len("data: ") :])
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        self.assertEqual(
+            events, [{"index": 1, "label": "L2"}, {"index": 0, "label": "L1"}]
+        )
 
     def test_predict_upload_success(self):
         # Create a dummy CSV file in memory
@@ -53,12 +100,134 @@ class TestApp(unittest.TestCase):
         )
         files = {"file": ("test.csv", io.BytesIO(csv_content.encode()), "text/csv")}
 
-        classifier.batch_classify.return_value = ["Critical Error", "Security Alert"]
+        self.classifier.classify_columns_async.return_value = [
+            "Critical Error",
+            "Security Alert",
+        ]
 
         response = self.client.post("/predict", files=files)
         self.assertEqual(response.status_code, 200)
         self.assertIn("test.csv", response.text)
         self.assertIn("Critical Error", response.text)
+        self.classifier.classify_columns_async.assert_called_once_with(
+            ["CRM", "Firewall"],
+            ["Error connecting to DB", "Block IP"],
+            limiter=app_module.CLASSIFY_SEMAPHORE,
+        )
+
+    def test_predict_large_upload_keeps_pool_at_base_size(self):
+        row = "CRM," + "x" * 1000 + "\n"
+        csv_content = "source,log_message\n" + row * (
+            app_module.UPLOAD_BUFFER_SIZE // len(row) + 1
+        )
+        self.assertGreater(len(csv_content), app_module.UPLOAD_BUFFER_SIZE)
+        rows = csv_content.count("\n") - 1
+        files = {"file": ("big.csv", io.BytesIO(csv_content.encode()), "text/csv")}
+        self.classifier.classify_columns_async.return_value = ["Error"] * rows
+
+        response = self.client.post("/predict", files=files)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            len(self.classifier.classify_columns_async.call_args[0][1]), rows
+        )
+        pooled = list(app_module.BUFFER_POOL.queue)
+        self.assertTrue(
+            all(len(buffer) == app_module.UPLOAD_BUFFER_SIZE for buffer in pooled)
+        )
+
+    def test_predict_embeds_results_json(self):
+        csv_content = "source,log_message\nCRM,Error connecting to DB"
+        files = {"file": ("test.csv", io.BytesIO(csv_content.encode()), "text/csv")}
+        self.classifier.classify_columns_async.return_value = ["Critical Error"]
+
+        response = self.client.post("/predict", files=files)
+        match = re.search(
+            r'<script id="results-data" type="application/json">(.*?)</script>',
+            response.text,
+        )
+        self.assertIsNotNone(match)
+        self.assertEqual(
+            json.loads(match.group(1)),
+            [
+                {
+                    "source": "CRM",
+                    "log_message": "Error connecting to DB",
+                    "label": "Critical Error",
+                }
+            ],
+        )
+
+    def test_predict_keeps_extra_columns_as_text(self):
+        csv_content = (
+            "timestamp,source,log_message,retries\n"
+            "2025-06-27T07:20:25,CRM,Error connecting to DB,3"
+        )
+        files = {"file": ("test.csv", io.BytesIO(csv_content.encode()), "text/csv")}
+        self.classifier.classify_columns_async.return_value = ["Critical Error"]
+
+        response = self.client.post("/predict", files=files)
+        self.assertEqual(response.status_code, 200)
+        match = re.search(
+            r'<script id="results-data" type="application/json">(.*?)</script>',
+            response.text,
+        )
+        self.assertIsNotNone(match)
+        self.assertEqual(
+            json.loads(match.group(1)),
+            [
+                {
+                    "timestamp": "2025-06-27T07:20:25",
+                    "source": "CRM",
+                    "log_message": "Error connecting to DB",
+                    "retries": "3",
+                    "label": "Critical Error",
+                }
+            ],
+        )
+
+    def test_predict_response_compressed(self):
+        rows = "".join(f"CRM,Error connecting to DB {i}\n" for i in range(200))
+        csv_content = "source,log_message\n" + rows
+        files = {"file": ("test.csv", io.BytesIO(csv_content.encode()), "text/csv")}
+        self.classifier.classify_columns_async.return_value = ["Critical Error"] * 200
+
+        response = self.client.post(
+            "/predict", files=files, headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers.get("content-encoding"), "gzip")
+
+    def test_classify_api_warming_up(self):
+        app_module.classifier = None
+        payload = {"source": "TestSrc", "log_message": "Test Message"}
+        response = self.client.post("/classify", json=payload)
+        self.assertEqual(response.status_code, 503)
+
+    def test_classify_api_load_failed(self):
+        app_module.classifier = None
+        with patch.object(
+            app_module,
+            "LogClassifier",
+            side_effect=FileNotFoundError("models/model.pkl"),
+        ):
+            asyncio.run(app_module._load_classifier())
+
+        payload = {"source": "TestSrc", "log_message": "Test Message"}
+        response = self.client.post("/classify", json=payload)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("models/model.pkl", response.json()["detail"])
+
+    def test_predict_upload_load_failed(self):
+        app_module.classifier = None
+        app_module.classifier_error = RuntimeError("corrupt ONNX export")
+        files = {"file": ("t.csv", io.BytesIO(b"source,log_message\nS,M"), "text/csv")}
+
+        response = self.client.post("/predict", files=files)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("corrupt ONNX export", response.text)
 
     def test_predict_upload_missing_columns(self):
         csv_content = "wrong_col,data\n1,2"
@@ -1,7 +1,14 @@
+import json
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 import numpy as np
-from processors.bert_processing import BertProcessor
+from processors.bert_processing import (
+    BertProcessor,
+    OnnxClassifier,
+    OnnxSentenceEncoder,
+)
 
 
 class TestBertProcessor(unittest.TestCase):
@@ -44,6 +51,62 @@ class TestBertProcessor(unittest.TestCase):
         label = self.processor.classify("Ambiguous message")
         self.assertEqual(label, "Unclassified")
 
+    def test_classify_batch(self):
+        self.mock_transformer.encode.return_value = np.zeros((3, 2))
+        self.mock_clf.classes_ = np.arange(5)
+        self.mock_clf.predict_proba.return_value = np.array(
+            [
+                [0.1, 0.0, 0.0, 0.0, 0.9],
+                [0.3, 0.3, 0.4, 0.0, 0.0],
+                [0.0, 0.0, 0.8, 0.1, 0.1],
+            ]
+        )
+
+        labels = self.processor.classify_batch(
+            ["Access denied for admin", "Request handled", "GET /api returned 404"]
+        )
+
+        self.assertEqual(labels, ["Security Alert", "Unclassified", "HTTP Status"])
+        self.mock_transformer.encode.assert_called_once()
+
+    def test_classify_batch_uses_cache(self):
+        self.mock_transformer.encode.return_value = np.zeros((1, 2))
+        self.mock_clf.classes_ = np.arange(5)
+        self.mock_clf.predict_proba.return_value = np.array([[0.0, 0.9, 0.0, 0.1, 0.0]])
+
+        dup = "Failed to parse payload"
+        self.assertEqual(self.processor.classify_batch([dup, dup]), ["Error", "Error"])
+        self.assertEqual(self.processor.classify_batch([dup]), ["Error"])
+
+        self.mock_transformer.encode.assert_called_once()
+        self.assertEqual(self.mock_transformer.encode.call_args[0][0], [dup])
+
+    def test_classify_skips_trivial_messages(self):
+        self.assertEqual(self.processor.classify("ok"), "Unclassified")
+        self.assertEqual(
+            self.processor.classify_batch(["", "   ", "12345678 -- 42"]),
+            ["Unclassified"] * 3,
+        )
+        self.mock_transformer.encode.assert_not_called()
+
+    def test_classify_batch_tolerates_missing_messages(self):
+        self.mock_transformer.encode.return_value = np.zeros((1, 2))
+        self.mock_clf.classes_ = np.arange(5)
+        self.mock_clf.predict_proba.return_value = np.array([[0.0, 0.9, 0.0, 0.1, 0.0]])
+
+        labels = self.processor.classify_batch(
+            ["Failed to parse payload", float("nan"), None]
+        )
+
+        self.assertEqual(labels, ["Error", "Unclassified", "Unclassified"])
+        self.assertEqual(
+            self.mock_transformer.encode.call_args[0][0], ["Failed to parse payload"]
+        )
+
+    def test_classify_batch_empty(self):
+        self.assertEqual(self.processor.classify_batch([]), [])
+        self.mock_transformer.encode.assert_not_called()
+
     def test_classify_not_initialized(self):
         self.processor.transformer = None
         self.processor.clf = None
@@ -51,12 +114,110 @@ class TestBertProcessor(unittest.TestCase):
         label = self.processor.classify("msg")
         self.assertEqual(label, "Unclassified")
 
-    @patch("processors.bert_processing.logging")
-    def test_classify_error(self, mock_logging):
+    @patch("processors.bert_processing.get_logger")
+    def test_classify_error(self, mock_get_logger):
         self.mock_transformer.encode.side_effect = Exception("Encode Error")
 
-        label = self.processor.classify("msg")
+        label = self.processor.classify("Worker crashed unexpectedly")
         self.assertEqual(label, "Unclassified")
+        self.mock_transformer.encode.assert_called_once()
+
+
+@patch("processors.bert_processing.ort")
+@patch("processors.bert_processing.ORTModelForFeatureExtraction")
+@patch("processors.bert_processing.AutoTokenizer")
+class TestOnnxSentenceEncoder(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.model_dir = Path(tmp.name)
+
+    def make_encoder(self, mock_tokenizer_cls, mock_model_cls):
+        self.tokenizer = mock_tokenizer_cls.from_pretrained.return_value
+        self.tokenizer.return_value = {
+            "input_ids": np.zeros((2, 3), dtype=np.int64),
+            "attention_mask": np.array([[1, 1, 0], [1, 0, 0]]),
+        }
+        self.model = mock_model_cls.from_pretrained.return_value
+        self.model.return_value = MagicMock(
+            last_hidden_state=np.array(
+                [
+                    [[3.0, 0.0], [1.0, 4.0], [100.0, 100.0]],
+                    [[0.0, 2.0], [50.0, 50.0], [50.0, 50.0]],
+                ]
+            )
+        )
+        return OnnxSentenceEncoder(self.model_dir)
+
+    def test_encode_mean_pools_over_mask_and_normalizes(
+        self, mock_tokenizer_cls, mock_model_cls, mock_ort
+    ):
+        encoder = self.make_encoder(mock_tokenizer_cls, mock_model_cls)
+
+        embeddings = encoder.encode(["first log", "second"])
+
+        # Padded positions are ignored: means are (2, 2) and (0, 2) before normalizing
+        np.testing.assert_allclose(
+            embeddings, [[2**-0.5, 2**-0.5], [0.0, 1.0]], rtol=1e-6
+        )
+        self.assertEqual(embeddings.dtype, np.float32)
+
+    def test_encode_truncates_like_sentence_transformer(
+        self, mock_tokenizer_cls, mock_model_cls, mock_ort
+    ):
+        encoder = self.make_encoder(mock_tokenizer_cls, mock_model_cls)
+
+        encoder.encode(["first log", "second"])
+
+        kwargs = self.tokenizer.call_args.kwargs
+        self.assertTrue(kwargs["truncation"])
+        self.assertEqual(kwargs["max_length"], 256)
+
+    def test_max_seq_length_read_from_export(
+        self, mock_tokenizer_cls, mock_model_cls, mock_ort
+    ):
+        (self.model_dir / "sentence_bert_config.json").write_text(
+            json.dumps({"max_seq_length": 128})
+        )
+
+        encoder = self.make_encoder(mock_tokenizer_cls, mock_model_cls)
+        encoder.encode(["first log", "second"])
+
+        self.assertEqual(self.tokenizer.call_args.kwargs["max_length"], 128)
+
+
+@patch("processors.bert_processing.ort")
+class TestOnnxClassifier(unittest.TestCase):
+    def make_classifier(self, mock_ort, proba):
+        session = mock_ort.InferenceSession.return_value
+        session.get_inputs.return_value = [MagicMock()]
+        session.get_inputs.return_value[0].name = "X"
+        session.get_outputs.return_value = [MagicMock(), MagicMock()]
+        session.get_outputs.return_value[1].name = "probabilities"
+        session.get_modelmeta.return_value.custom_metadata_map = {
+            "classes": json.dumps([0, 2, 4])
+        }
+        session.run.return_value = [proba]
+        return OnnxClassifier(Path("clf.onnx")), session
+
+    def test_predict_proba_runs_probability_output(self, mock_ort):
+        proba = np.array([[0.1, 0.7, 0.2]], dtype=np.float32)
+        clf, session = self.make_classifier(mock_ort, proba)
+
+        result = clf.predict_proba(np.zeros((1, 4), dtype=np.float64))
+
+        np.testing.assert_array_equal(result, proba)
+        outputs, feeds = session.run.call_args[0]
+        self.assertEqual(outputs, ["probabilities"])
+        self.assertEqual(feeds["X"].dtype, np.float32)
+
+    def test_predict_maps_argmax_to_classes(self, mock_ort):
+        clf, _ = self.make_classifier(
+            mock_ort, np.array([[0.1, 0.7, 0.2], [0.1, 0.2, 0.7]])
+        )
+
+        np.testing.assert_array_equal(clf.classes_, [0, 2, 4])
+        np.testing.assert_array_equal(clf.predict(np.zeros((2, 4))), [2, 4])
 
 
 if __name__ == "__main__":
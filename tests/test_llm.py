@@ -1,7 +1,10 @@
+import asyncio
+import threading
 import unittest
 from io import StringIO
-from unittest.mock import MagicMock, patch
-from processors.llm_processing import LlmProcessor
+from unittest.mock import AsyncMock, MagicMock, patch
+from processors import llm_processing
+from processors.llm_processing import LlmProcessor, get_chat_model, get_event_loop
 
 
 class TestLlmProcessor(unittest.TestCase):
@@ -14,11 +17,13 @@ class TestLlmProcessor(unittest.TestCase):
         self.MockChat = self.patcher_chat.start()
         self.MockPrompt = self.patcher_prompt.start()
         self.MockParser = self.patcher_parser.start()
+        get_chat_model.cache_clear()
 
     def tearDown(self):
         self.patcher_chat.stop()
         self.patcher_prompt.stop()
         self.patcher_parser.stop()
+        get_chat_model.cache_clear()
 
     def test_classify_success(self):
         # Setup the chain mock
@@ -44,6 +49,208 @@ class TestLlmProcessor(unittest.TestCase):
         label = processor.classify("Some message")
         self.assertEqual(label, "Unclassified")
 
+    @patch("processors.llm_processing.time.sleep")
+    def test_classify_rate_limited(self, mock_sleep):
+        processor = LlmProcessor(requests_per_second=1.0)
+        processor.chain = MagicMock()
+        processor.chain.invoke.return_value = MagicMock(label="Error")
+
+        processor.classify("First message")
+        mock_sleep.assert_not_called()
+
+        processor.classify("Second message")
+        mock_sleep.assert_called_once()
+        self.assertGreater(mock_sleep.call_args[0][0], 0)
+
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_classify_many(self, mock_stdout):
+        processor = LlmProcessor(requests_per_second=1000.0)
+        processor.chain = MagicMock()
+
+        def respond(inputs):
+            if inputs["message"] == "m2":
+                raise Exception("API Error")
+            return MagicMock(label=f"Label {inputs['message']}")
+
+        processor.chain.ainvoke = AsyncMock(side_effect=respond)
+
+        labels = asyncio.run(processor.classify_many(["m1", "m2", "m3"]))
+
+        self.assertEqual(labels, ["Label m1", "Unclassified", "Label m3"])
+        self.assertEqual(processor.chain.ainvoke.await_count, 3)
+
+    def test_classify_many_isolates_failures(self):
+        processor = LlmProcessor()
+
+        async def classify_async(message):
+            if message == "m2":
+                raise RuntimeError("Event loop failure")
+            return f"Label {message}"
+
+        processor.classify_async = classify_async
+
+        labels = asyncio.run(processor.classify_many(["m1", "m2", "m1"]))
+
+        self.assertEqual(labels, ["Label m1", "Unclassified", "Label m1"])
+
+    def test_classify_as_completed(self):
+        processor = LlmProcessor()
+
+        async def classify_chunk(chunk):
+            if "slow" in chunk:
+                await asyncio.sleep(0.01)
+            if "bad" in chunk:
+                raise RuntimeError("Event loop failure")
+            return {message: f"Label {message}" for message in chunk}
+
+        processor._classify_chunk_async = classify_chunk
+
+        async def collect():
+            return [
+                pair
+                async for pair in processor.classify_as_completed(
+                    ["slow", "fast", "bad", "fast"], k=1
+                )
+            ]
+
+        pairs = asyncio.run(collect())
+
+        self.assertEqual(pairs[-1], ("slow", "Label slow"))
+        self.assertCountEqual(
+            pairs,
+            [("slow", "Label slow"), ("fast", "Label fast"), ("bad", "Unclassified")],
+        )
+
+    def test_classify_as_completed_marshals_uncached_messages(self):
+        processor = LlmProcessor(requests_per_second=1000.0)
+        processor.cache.put("m0", "Error")
+        chain = MagicMock()
+        chain.ainvoke = AsyncMock(
+            return_value="<label 1>HTTP Status</label>\n<label 2>Error</label>"
+        )
+        processor._marshalled_chain = MagicMock(return_value=chain)
+
+        async def collect():
+            return [
+                pair
+                async for pair in processor.classify_as_completed(["m0", "m1", "m2"])
+            ]
+
+        pairs = asyncio.run(collect())
+
+        self.assertEqual(
+            pairs, [("m0", "Error"), ("m1", "HTTP Status"), ("m2", "Error")]
+        )
+        chain.ainvoke.assert_awaited_once_with({"messages": "1. m1\n2. m2"})
+
+    def test_classify_marshalled(self):
+        processor = LlmProcessor(requests_per_second=1000.0)
+        chain = MagicMock()
+        chain.ainvoke = AsyncMock(
+            return_value="<label 1>Error</label>\n<label 2>Security Alert</label>"
+        )
+        processor._marshalled_chain = MagicMock(return_value=chain)
+
+        labels = processor.classify_marshalled(["m1", "m2", "m1"])
+
+        self.assertEqual(labels, ["Error", "Security Alert", "Error"])
+        processor._marshalled_chain.assert_called_once_with(2)
+        chain.ainvoke.assert_awaited_once_with({"messages": "1. m1\n2. m2"})
+
+    def test_classify_marshalled_falls_back_on_partial_parse(self):
+        processor = LlmProcessor(requests_per_second=1000.0)
+        chain = MagicMock()
+        chain.ainvoke = AsyncMock(return_value="<label 1>Error</label>")
+        processor._marshalled_chain = MagicMock(return_value=chain)
+        processor.chain = MagicMock()
+        processor.chain.ainvoke = AsyncMock(return_value=MagicMock(label="HTTP Status"))
+
+        labels = processor.classify_marshalled(["m1", "m2"])
+
+        self.assertEqual(labels, ["HTTP Status", "HTTP Status"])
+        self.assertEqual(processor.chain.ainvoke.await_count, 2)
+
+    def test_classify_marshalled_skips_missing_messages(self):
+        processor = LlmProcessor(requests_per_second=1000.0)
+        chain = MagicMock()
+        chain.ainvoke = AsyncMock(
+            return_value="<label 1>Error</label>\n<label 2>Error</label>"
+            "\n<label 3>HTTP Status</label>"
+        )
+        processor._marshalled_chain = MagicMock(return_value=chain)
+        nan = float("nan")
+
+        labels = processor.classify_marshalled(
+            ["valid one", "valid two", nan, "valid three"]
+        )
+
+        self.assertEqual(labels, ["Error", "Error", "Unclassified", "HTTP Status"])
+        chain.ainvoke.assert_awaited_once_with(
+            {"messages": "1. valid one\n2. valid two\n3. valid three"}
+        )
+
+    def test_classify_as_completed_skips_missing_messages(self):
+        processor = LlmProcessor(requests_per_second=1000.0)
+        chain = MagicMock()
+        chain.ainvoke = AsyncMock(return_value="<label 1>Error</label>")
+        processor._marshalled_chain = MagicMock(return_value=chain)
+
+        async def collect():
+            return [
+                pair async for pair in processor.classify_as_completed([None, "m1"])
+            ]
+
+        self.assertEqual(
+            asyncio.run(collect()), [(None, "Unclassified"), ("m1", "Error")]
+        )
+
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_classify_marshalled_isolates_failed_chunks(self, mock_stdout):
+        processor = LlmProcessor(requests_per_second=1000.0)
+
+        async def ainvoke(inputs):
+            if "m2" in inputs["messages"]:
+                raise Exception("API Error")
+            return "<label 1>Error</label>"
+
+        chain = MagicMock()
+        chain.ainvoke = ainvoke
+        processor._marshalled_chain = MagicMock(return_value=chain)
+
+        labels = processor.classify_marshalled(["m1", "m2", "m3"], k=1)
+
+        self.assertEqual(labels, ["Error", "Unclassified", "Error"])
+        self.assertEqual(processor._marshalled_chain.call_count, 3)
+
+    def test_event_loop_shared_across_threads(self):
+        original = llm_processing._event_loop
+        llm_processing._event_loop = None
+        self.addCleanup(setattr, llm_processing, "_event_loop", original)
+
+        barrier = threading.Barrier(8)
+        loops = []
+
+        def first_call():
+            barrier.wait()
+            loops.append(get_event_loop())
+
+        threads = [threading.Thread(target=first_call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(loops), 8)
+        self.assertEqual(len({id(loop) for loop in loops}), 1)
+        loops[0].call_soon_threadsafe(loops[0].stop)
+
+    def test_chat_model_shared(self):
+        first = LlmProcessor()
+        second = LlmProcessor()
+
+        self.assertIs(first.model, second.model)
+        self.MockChat.assert_called_once()
+
     @patch("sys.stdout", new_callable=StringIO)
     def test_init_failure(self, mock_stdout):
         # Simulate initialization failure
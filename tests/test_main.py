@@ -0,0 +1,232 @@
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+import httpx
+from main import LogClassifier
+from processors.llm_processing import get_chat_model
+
+
+class LabelHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "5")
+        self.end_headers()
+        self.wfile.write(b"Error")
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpChain:
+    """
+    Stands in for the LangChain chain, answering through a pooled async HTTP client
+    that, like the Gemini client, stays bound to the event loop it first ran on.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.client = httpx.AsyncClient()
+
+    async def ainvoke(self, inputs):
+        label = (await self.client.get(self.url)).text
+        if "messages" in inputs:
+            lines = inputs["messages"].splitlines()
+            return "\n".join(
+                f"<label {i}>{label}</label>" for i in range(1, len(lines) + 1)
+            )
+        return MagicMock(label=label)
+
+
+class LabelChain:
+    """
+    Stands in for the LangChain chain, labelling messages from a fixed table and
+    recording every message it was asked about.
+    """
+
+    def __init__(self, labels):
+        self.labels = labels
+        self.seen = []
+
+    async def ainvoke(self, inputs):
+        if "messages" in inputs:
+            lines = [line.split(". ", 1) for line in inputs["messages"].splitlines()]
+            self.seen.extend(message for _, message in lines)
+            return "\n".join(
+                f"<label {i}>{self.labels[message]}</label>" for i, message in lines
+            )
+        self.seen.append(inputs["message"])
+        return MagicMock(label=self.labels[inputs["message"]])
+
+
+REGEX_MESSAGE = "User User1 logged in."
+BERT_MESSAGE = "Disk usage at 91% on /var"
+LLM_MESSAGE = "Workflow escalated to legal review"
+
+
+class TestLogClassifier(unittest.TestCase):
+    def setUp(self):
+        self.patchers = [
+            patch("main.BertProcessor"),
+            patch("processors.llm_processing.ChatGoogleGenerativeAI"),
+            patch("processors.llm_processing.PromptTemplate"),
+            patch("processors.llm_processing.PydanticOutputParser"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        get_chat_model.cache_clear()
+
+        self.classifier = LogClassifier()
+        self.bert = self.classifier.bert_processor
+        self.bert.classify_batch.side_effect = lambda messages: ["Unclassified"] * len(
+            messages
+        )
+        self.llm = self.classifier.llm_processor
+        self.llm._min_interval = 0.0
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        get_chat_model.cache_clear()
+
+    def use_layers(self):
+        self.bert.classify_batch.side_effect = lambda messages: [
+            "Resource Usage" if message == BERT_MESSAGE else "Unclassified"
+            for message in messages
+        ]
+        chain = LabelChain({LLM_MESSAGE: "Workflow Error"})
+        self.llm.chain = chain
+        self.llm._marshalled_chain = MagicMock(return_value=chain)
+        return chain
+
+    def test_classify_locally_skips_bert_for_regex_hits(self):
+        self.use_layers()
+
+        labels = self.classifier.classify_locally(
+            [REGEX_MESSAGE, BERT_MESSAGE, LLM_MESSAGE]
+        )
+
+        self.assertEqual(labels, ["USER_ACTION", "Resource Usage", "Unclassified"])
+        self.bert.classify_batch.assert_called_once_with([BERT_MESSAGE, LLM_MESSAGE])
+
+    def test_batch_classify_columns_routes_each_layer(self):
+        chain = self.use_layers()
+        messages = [
+            LLM_MESSAGE,
+            REGEX_MESSAGE,
+            BERT_MESSAGE,
+            LLM_MESSAGE,
+            REGEX_MESSAGE,
+            BERT_MESSAGE,
+        ]
+
+        labels = self.classifier.batch_classify_columns(["S"] * 6, messages)
+
+        self.assertEqual(
+            labels,
+            [
+                "Workflow Error",
+                "USER_ACTION",
+                "Resource Usage",
+                "Workflow Error",
+                "USER_ACTION",
+                "Resource Usage",
+            ],
+        )
+        # Each distinct message reaches BERT and the LLM at most once
+        self.bert.classify_batch.assert_called_once_with([LLM_MESSAGE, BERT_MESSAGE])
+        self.assertEqual(chain.seen, [LLM_MESSAGE])
+
+    def test_batch_classify_columns_skips_llm_when_resolved_locally(self):
+        chain = self.use_layers()
+
+        labels = self.classifier.batch_classify_columns(
+            ["S", "S"], [REGEX_MESSAGE, BERT_MESSAGE]
+        )
+
+        self.assertEqual(labels, ["USER_ACTION", "Resource Usage"])
+        self.assertEqual(chain.seen, [])
+
+    def test_classify_columns_async_releases_limiter_before_llm(self):
+        chain = self.use_layers()
+        limiter = asyncio.Semaphore(1)
+        limiter_held = []
+        ainvoke = chain.ainvoke
+
+        async def record_limiter(inputs):
+            limiter_held.append(limiter.locked())
+            return await ainvoke(inputs)
+
+        chain.ainvoke = record_limiter
+        messages = [LLM_MESSAGE, REGEX_MESSAGE, BERT_MESSAGE, LLM_MESSAGE]
+
+        async def classify():
+            return await self.classifier.classify_columns_async(
+                ["S"] * 4, messages, limiter=limiter
+            )
+
+        labels = asyncio.run(classify())
+
+        self.assertEqual(
+            labels,
+            ["Workflow Error", "USER_ACTION", "Resource Usage", "Workflow Error"],
+        )
+        self.assertEqual(limiter_held, [False])
+        self.assertEqual(chain.seen, [LLM_MESSAGE])
+
+    def test_classify_message_async_routes_each_layer(self):
+        chain = self.use_layers()
+
+        async def classify(message):
+            return await self.classifier.classify_message_async(
+                "S", message, limiter=asyncio.Semaphore(1)
+            )
+
+        self.assertEqual(asyncio.run(classify(REGEX_MESSAGE)), "USER_ACTION")
+        self.assertEqual(asyncio.run(classify(BERT_MESSAGE)), "Resource Usage")
+        self.assertEqual(asyncio.run(classify(LLM_MESSAGE)), "Workflow Error")
+        self.assertEqual(chain.seen, [LLM_MESSAGE])
+
+    def test_stream_classify_columns_yields_local_labels_first(self):
+        chain = self.use_layers()
+        messages = [LLM_MESSAGE, REGEX_MESSAGE, LLM_MESSAGE, BERT_MESSAGE]
+
+        async def collect():
+            return [
+                event
+                async for event in self.classifier.stream_classify_columns(
+                    ["S"] * 4, messages
+                )
+            ]
+
+        events = asyncio.run(collect())
+
+        self.assertEqual(events[:2], [(1, "USER_ACTION"), (3, "Resource Usage")])
+        self.assertEqual(
+            sorted(events[2:]), [(0, "Workflow Error"), (2, "Workflow Error")]
+        )
+        self.assertEqual(chain.seen, [LLM_MESSAGE])
+
+    def test_llm_client_survives_repeated_batches(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), LabelHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        chain = HttpChain(f"http://127.0.0.1:{server.server_port}/")
+        self.llm.chain = chain
+        self.llm._marshalled_chain = MagicMock(return_value=chain)
+        self.addCleanup(self.llm.run, chain.client.aclose())
+
+        first = self.classifier.batch_classify_columns(["S"], ["Unknown failure one"])
+        second = self.classifier.batch_classify_columns(["S"], ["Unknown failure two"])
+
+        self.assertEqual(first, ["Error"])
+        self.assertEqual(second, ["Error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
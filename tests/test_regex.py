@@ -0,0 +1,91 @@
+import unittest
+from processors import regex_processing
+from processors.regex_processing import DEFAULT_PROCESSOR, RegexProcessor, classify
+
+
+class TestRegexProcessor(unittest.TestCase):
+    def setUp(self):
+        self.processor = RegexProcessor()
+
+    def test_anchored_rules(self):
+        cases = {
+            "User User123 logged in.": "USER_ACTION",
+            "User User7 logged out.": "USER_ACTION",
+            "Account with ID 42 created by User9.": "USER_ACTION",
+            "Backup started at 2025-05-14 07:06:55.": "SYSTEM_NOTIFICATION",
+            "Backup ended at 2025-05-14 07:19:02.": "SYSTEM_NOTIFICATION",
+            "Backup completed successfully.": "SYSTEM_NOTIFICATION",
+            "System updated to version 3.4.12.": "SYSTEM_NOTIFICATION",
+            "System reboot initiated by user User243.": "SYSTEM_NOTIFICATION",
+            "File data_6957.csv uploaded successfully by user User265.": (
+                "SYSTEM_NOTIFICATION"
+            ),
+            "Disk cleanup completed successfully.": "SYSTEM_NOTIFICATION",
+        }
+        for message, label in cases.items():
+            with self.subTest(message=message):
+                self.assertEqual(self.processor.classify(message), label)
+
+    def test_every_anchored_rule_is_covered(self):
+        self.assertEqual(
+            set(regex_processing.ANCHORED_RULES),
+            {"user", "account", "backup", "system", "file", "disk"},
+        )
+
+    def test_user_login_successful_is_case_insensitive(self):
+        for message in (
+            "User login successful.",
+            "user login successful.",
+            "USER LOGIN SUCCESSFUL.",
+        ):
+            with self.subTest(message=message):
+                self.assertEqual(self.processor.classify(message), "USER_ACTION")
+
+    def test_other_user_messages_are_case_sensitive(self):
+        self.assertIsNone(self.processor.classify("user User123 logged in."))
+
+    def test_trailing_newline_still_matches(self):
+        self.assertEqual(
+            self.processor.classify("Disk cleanup completed successfully.\n"),
+            "SYSTEM_NOTIFICATION",
+        )
+
+    def test_security_rule(self):
+        self.assertEqual(
+            self.processor.classify("Unauthorized access to admin panel"),
+            "SECURITY_ALERT",
+        )
+        self.assertEqual(
+            self.processor.classify("IP 10.0.0.1 BLOCKED after 5 attempts"),
+            "SECURITY_ALERT",
+        )
+
+    def test_security_rule_respects_word_boundaries(self):
+        self.assertIsNone(self.processor.classify("Request unblocked by firewall"))
+
+    def test_unmatched_first_word_falls_through_to_security_rule(self):
+        self.assertEqual(
+            self.processor.classify("Disk access blocked for User12."),
+            "SECURITY_ALERT",
+        )
+        self.assertEqual(
+            self.processor.classify("Backup failed login check for User3."),
+            "SECURITY_ALERT",
+        )
+
+    def test_no_match(self):
+        self.assertIsNone(self.processor.classify("Payment processed for order 991"))
+
+    def test_classify_caches_results(self):
+        self.processor.classify("Backup completed successfully.")
+        self.processor.classify("Backup completed successfully.")
+        self.assertEqual(self.processor.cached_classify.cache_info().hits, 1)
+
+    def test_module_level_classify(self):
+        self.assertIsInstance(DEFAULT_PROCESSOR, RegexProcessor)
+        self.assertEqual(classify("User User1 logged in."), "USER_ACTION")
+        self.assertIsNone(classify("Nothing to see here"))
+
+
+if __name__ == "__main__":
+    unittest.main()
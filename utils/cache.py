@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Sentinel returned by LRUCache.get on a miss, so that None can be cached as a value.
+MISSING: Any = object()
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded least-recently-used cache.
+
+    Responsibilities:
+        - Store up to `maxsize` key/value pairs, evicting the least recently used entry.
+        - Track hit and miss counts for metrics.
+    """
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of entries kept before eviction.
+        """
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """
+        Looks up a key and marks it as most recently used.
+
+        Args:
+            key (Hashable): The key to look up.
+            default (Any): Value returned when the key is absent.
+
+        Returns:
+            Any: The cached value, or `default` on a miss.
+        """
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): The key to store.
+            value (Any): The value to associate with the key.
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
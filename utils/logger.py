@@ -1,9 +1,11 @@
 import os
 import logging
+import functools
 import colorlog
 from from_root import from_root
 from logging.handlers import RotatingFileHandler
 from datetime import datetime
+from typing import Optional
 
 
 def fallback_from_root() -> str:
@@ -18,16 +20,12 @@ def get_current_timestamp() -> str:
 # from_root: Callable[[], str] = fallback_from_root
 
 LOGS_DIR: str = "logs"
-LOG_FILE_FORMAT: str = f"{get_current_timestamp()}.log"
 
 maxBytes: int = 5 * 1024 * 1024  # 5 MB
 backupCount: int = 4
 
-logs_dirpath: str = os.path.join(from_root(), LOGS_DIR)
-os.makedirs(logs_dirpath, exist_ok=True)
-log_filepath: str = os.path.join(logs_dirpath, LOG_FILE_FORMAT)
-
 
+@functools.cache
 def config_logger() -> None:
     """
     Configures the root logger with a colored console handler and a rotating file handler.
@@ -36,6 +34,9 @@ def config_logger() -> None:
     and a rotating file for persistent storage. Handlers are added only if none exist
     to prevent duplicates. The logger level is set to DEBUG for maximum verbosity.
 
+    Runs once, on the first call to `get_logger`, so importing this module has no side
+    effects; the log file is named after the time of that first call.
+
     Handlers:
     - Console: Uses colorlog for level-specific colors, logs at DEBUG level.
     - File: Rotates files when they exceed maxBytes, keeps up to backupCount backups.
@@ -72,6 +73,10 @@ def config_logger() -> None:
     )
 
     if not logger.handlers:
+        logs_dirpath: str = os.path.join(from_root(), LOGS_DIR)
+        os.makedirs(logs_dirpath, exist_ok=True)
+        log_filepath: str = os.path.join(logs_dirpath, f"{get_current_timestamp()}.log")
+
         console_handler: logging.StreamHandler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(console_format)
@@ -85,4 +90,15 @@ def config_logger() -> None:
         logger.addHandler(file_handler)
 
 
-config_logger()
+def get_logger(name: Optional[str] = None) -> logging.Logger:
+    """
+    Returns a logger, configuring logging on first use.
+
+    Args:
+        name (Optional[str]): Logger name, usually the caller's `__name__`; None for the root logger.
+
+    Returns:
+        logging.Logger: The configured logger.
+    """
+    config_logger()
+    return logging.getLogger(name)